@@ -11,9 +11,11 @@ All actions require Human-in-the-Loop (HITL) approval.
 """
 
 from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 from datetime import datetime
+from ciso8601 import parse_datetime
 import json
 
 # Import our agents
@@ -38,7 +40,7 @@ except ImportError:
     TESSERACT_AVAILABLE = False
     print("⚠️  Tesseract not installed. Run: pip install pytesseract pillow")
 
-app = FastAPI(title="Aegis Advocate Module")
+app = FastAPI(title="Aegis Advocate Module", default_response_class=ORJSONResponse)
 
 # Initialize agents
 insurance_policy = InsurancePolicy("PPO")
@@ -83,6 +85,19 @@ class NegotiationScriptRequest(BaseModel):
 # MEDICAL BILL FORENSICS
 # ============================================================================
 
+def _to_lineitem(item: Dict) -> LineItem:
+    """Build a LineItem from a request dict"""
+    date_of_service = item.get("date_of_service")
+    return LineItem(
+        code=item["code"],
+        description=item["description"],
+        quantity=item["quantity"],
+        unit_price=item["unit_price"],
+        total=item["total"],
+        date_of_service=parse_datetime(date_of_service) if date_of_service else None
+    )
+
+
 @app.post("/advocate/analyze-bill")
 async def analyze_bill(request: BillAnalysisRequest):
     """
@@ -98,33 +113,12 @@ async def analyze_bill(request: BillAnalysisRequest):
     """
     
     # Convert dict line items to LineItem objects
-    line_items = []
-    for item in request.line_items:
-        line_items.append(LineItem(
-            code=item["code"],
-            description=item["description"],
-            quantity=item["quantity"],
-            unit_price=item["unit_price"],
-            total=item["total"],
-            date_of_service=datetime.fromisoformat(item["date_of_service"]) if item.get("date_of_service") else None
-        ))
+    line_items = [_to_lineitem(item) for item in request.line_items]
     
     # Convert previous bills if provided
     previous_bills = None
     if request.previous_bills:
-        previous_bills = []
-        for prev_bill in request.previous_bills:
-            prev_items = []
-            for item in prev_bill:
-                prev_items.append(LineItem(
-                    code=item["code"],
-                    description=item["description"],
-                    quantity=item["quantity"],
-                    unit_price=item["unit_price"],
-                    total=item["total"],
-                    date_of_service=datetime.fromisoformat(item["date_of_service"]) if item.get("date_of_service") else None
-                ))
-            previous_bills.append(prev_items)
+        previous_bills = [[_to_lineitem(item) for item in prev_bill] for prev_bill in request.previous_bills]
     
     # Analyze bill
     analysis = bill_auditor.analyze_bill(
@@ -153,7 +147,7 @@ async def analyze_bill(request: BillAnalysisRequest):
         "risk_score": analysis.risk_score,
         "negotiation_script": negotiation_script,
         "action_required": analysis.risk_score > 50,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
 
 
@@ -239,7 +233,7 @@ async def audit_subscriptions(request: SubscriptionAuditRequest):
     transactions = []
     for txn in request.transactions:
         transactions.append(Transaction(
-            date=datetime.fromisoformat(txn["date"]),
+            date=parse_datetime(txn["date"]),
             merchant=txn["merchant"],
             amount=txn["amount"],
             category=txn["category"],
@@ -271,7 +265,7 @@ async def audit_subscriptions(request: SubscriptionAuditRequest):
             "merchant": sub.merchant,
             "frequency": sub.frequency,
             "average_amount": sub.average_amount,
-            "last_charge": sub.last_charge.isoformat(),
+            "last_charge": sub.last_charge,
             "total_charges": sub.total_charges,
             "total_spent": sub.total_spent,
             "confidence": sub.confidence,
@@ -286,7 +280,7 @@ async def audit_subscriptions(request: SubscriptionAuditRequest):
         "potential_monthly_savings": potential_savings,
         "potential_annual_savings": potential_savings * 12,
         "action_required": potential_savings > 0,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
 
 
@@ -330,7 +324,7 @@ async def cancel_subscription(request: CancellationRequest):
         "screenshots": result.screenshots,
         "dark_patterns_detected": result.dark_patterns_detected,
         "error_message": result.error_message,
-        "timestamp": result.timestamp.isoformat(),
+        "timestamp": result.timestamp,
         "shadow_mode": cancellation_agent.read_only
     }
 
@@ -3,7 +3,7 @@ Trusted Advocate Notification System
 Sends alerts to caregivers/advocates for pending approvals
 """
 from typing import Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,7 +48,7 @@ class TrustedAdvocateNotifier:
         notification = {
             "type": "SCAM_DETECTED",
             "severity": "CRITICAL" if fraud_score > 80 else "HIGH",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "user_id": user_id,
             "details": {
                 "fraud_score": fraud_score,
@@ -88,7 +88,7 @@ class TrustedAdvocateNotifier:
         notification = {
             "type": "TRANSACTION_APPROVAL_REQUIRED",
             "severity": "CRITICAL" if risk_level == "CRITICAL" else "MEDIUM",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "user_id": user_id,
             "approval_id": approval_id,
             "details": {
@@ -139,7 +139,7 @@ class TrustedAdvocateNotifier:
         
         return {
             "success": True,
-            "notification_id": f"notif_{int(datetime.utcnow().timestamp())}",
+            "notification_id": f"notif_{int(datetime.now(timezone.utc).timestamp())}",
             "channels": ["LOG", "WEBHOOK"] if self.webhook_url else ["LOG"],
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
@@ -0,0 +1,244 @@
+"""
+Project Aegis: Advocate Module - FastAPI Router
+Medical bill forensics, subscription audits and negotiation scripts
+"""
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+from functools import lru_cache
+from datetime import datetime
+import json
+import orjson
+
+from advocate_bill_auditor import AgenticAuditor, InsurancePolicy, LineItem
+from advocate_subscription_detector import SubscriptionDetector, Transaction
+from advocate_cancellation_agent import CancellationAgent
+from advocate_negotiation_agent import NegotiationScriptGenerator
+from request_models import LineItemIn, BillAnalysisRequest, SubscriptionAuditRequest, NegotiationScriptRequest
+
+# Router (dict results are serialized by orjson without response-model validation)
+router = APIRouter(tags=["Advocate"], default_response_class=ORJSONResponse)
+
+# Initialize Advocate components
+insurance_policy = InsurancePolicy("PPO")
+bill_auditor = AgenticAuditor(insurance_policy)
+subscription_detector = SubscriptionDetector()
+cancellation_agent = CancellationAgent(read_only=True)
+script_generator = NegotiationScriptGenerator()
+
+# Scripts are deterministic in their inputs, so rendered output is memoized.
+# Each entry is (script, formatted_for_human, formatted_for_voice).
+def _render_script(script):
+    return (
+        script,
+        script_generator.format_script_for_human(script),
+        script_generator.format_script_for_voice(script)
+    )
+
+@lru_cache(maxsize=1024)
+def _medical_dispute_script(provider_name: str, errors_key: str, total_disputed: float, policy_holder_name: str):
+    """errors_key is the sorted-keys JSON of the error list (dicts aren't hashable)"""
+    return _render_script(script_generator.generate_medical_bill_dispute(
+        provider_name=provider_name,
+        errors=json.loads(errors_key),
+        total_disputed=total_disputed,
+        policy_holder_name=policy_holder_name
+    ))
+
+@lru_cache(maxsize=1024)
+def _subscription_dispute_script(merchant: str, subscription_amount: float, months_unused: int, reason: str):
+    return _render_script(script_generator.generate_subscription_cancellation_dispute(
+        merchant=merchant,
+        subscription_amount=subscription_amount,
+        months_unused=months_unused,
+        reason=reason
+    ))
+
+def _to_lineitem(item: LineItemIn) -> LineItem:
+    """Build a LineItem straight from validated fields (no intermediate dict)"""
+    return LineItem(
+        code=item.code,
+        description=item.description,
+        quantity=item.quantity,
+        unit_price=item.unit_price,
+        total=item.total,
+        date_of_service=item.date_of_service
+    )
+
+@router.post("/advocate/analyze-bill", response_model=None)
+async def analyze_bill(request: BillAnalysisRequest):
+    """Analyze medical bill for errors"""
+    # Convert validated line items to LineItem objects
+    line_items = [_to_lineitem(item) for item in request.line_items]
+    
+    # Convert previous bills if provided
+    previous_bills = None
+    if request.previous_bills:
+        previous_bills = [[_to_lineitem(item) for item in prev_bill] for prev_bill in request.previous_bills]
+    
+    # Analyze bill
+    analysis = bill_auditor.analyze_bill(
+        line_items=line_items,
+        is_in_network=request.is_in_network,
+        previous_bills=previous_bills
+    )
+    
+    # Generate negotiation script if errors found
+    negotiation_script = None
+    if analysis.errors and analysis.potential_savings > 0:
+        _, negotiation_script, _ = _medical_dispute_script(
+            "Medical Provider",
+            json.dumps(analysis.errors, sort_keys=True),
+            analysis.potential_savings,
+            "Patient"
+        )
+    
+    return {
+        "total_billed": analysis.total_billed,
+        "total_allowed": analysis.total_allowed,
+        "potential_savings": analysis.potential_savings,
+        "errors": analysis.errors,
+        "recommendations": analysis.recommendations,
+        "risk_score": analysis.risk_score,
+        "negotiation_script": negotiation_script,
+        "action_required": analysis.risk_score > 50,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.post("/advocate/subscriptions/audit", response_model=None)
+async def audit_subscriptions(request: SubscriptionAuditRequest):
+    """Detect and analyze subscriptions from transaction history"""
+    # Convert validated transactions to Transaction objects
+    transactions = [Transaction(**txn.model_dump()) for txn in request.transactions]
+    
+    # Detect subscriptions
+    subscriptions = subscription_detector.detect_subscriptions(
+        transactions=transactions,
+        usage_data=request.usage_data
+    )
+    
+    # Calculate totals and convert to dict in a single pass
+    total_monthly_cost = 0
+    potential_savings = 0
+    subscriptions_dict = []
+    for sub in subscriptions:
+        monthly_cost = sub.average_amount if sub.frequency == "MONTHLY" else sub.average_amount / 12
+        total_monthly_cost += monthly_cost
+        if sub.recommendation == "CANCEL":
+            potential_savings += monthly_cost
+    
+        subscriptions_dict.append({
+            "merchant": sub.merchant,
+            "frequency": sub.frequency,
+            "average_amount": sub.average_amount,
+            "last_charge": sub.last_charge,
+            "total_charges": sub.total_charges,
+            "total_spent": sub.total_spent,
+            "confidence": sub.confidence,
+            "usage_score": sub.usage_score,
+            "recommendation": sub.recommendation,
+            "reasoning": sub.reasoning
+        })
+    
+    return {
+        "subscriptions": subscriptions_dict,
+        "total_monthly_cost": total_monthly_cost,
+        "potential_monthly_savings": potential_savings,
+        "potential_annual_savings": potential_savings * 12,
+        "action_required": potential_savings > 0,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.post("/advocate/generate-script", response_model=None)
+async def generate_negotiation_script(request: NegotiationScriptRequest):
+    """Generate professional negotiation script"""
+    if request.script_type == "MEDICAL_BILL":
+        if not request.errors or request.total_disputed is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Medical bill script requires 'errors' and 'total_disputed'"
+            )
+        
+        script, formatted_script, voice_script = _medical_dispute_script(
+            request.merchant,
+            json.dumps(request.errors, sort_keys=True),
+            request.total_disputed,
+            request.policy_holder_name or "Patient"
+        )
+    
+    elif request.script_type == "SUBSCRIPTION":
+        if request.subscription_amount is None or request.months_unused is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Subscription script requires 'subscription_amount' and 'months_unused'"
+            )
+        
+        script, formatted_script, voice_script = _subscription_dispute_script(
+            request.merchant,
+            request.subscription_amount,
+            request.months_unused,
+            request.reason or "zero usage detected"
+        )
+    
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown script type: {request.script_type}"
+        )
+    
+    return {
+        "merchant": script.merchant,
+        "script_type": script.script_type,
+        "tone": script.tone,
+        "estimated_duration": script.estimated_duration,
+        "formatted_script": formatted_script,
+        "voice_script": voice_script,
+        "expected_outcome": script.expected_outcome,
+        "fallback_options": script.fallback_options
+    }
+
+# Static payload: serialize once at import instead of on every GET
+_ADVOCATE_SUMMARY_BYTES = orjson.dumps({
+    "module": "Advocate",
+    "status": "operational",
+    "capabilities": {
+        "medical_bill_forensics": {
+            "available": True,
+            "features": [
+                "Upcoding detection",
+                "Duplicate billing detection",
+                "Unbundling detection",
+                "Insurance policy verification",
+                "Negotiation script generation"
+            ]
+        },
+        "subscription_management": {
+            "available": True,
+            "features": [
+                "Subscription detection from transactions",
+                "Usage analysis",
+                "Cancellation recommendations",
+                "Autonomous cancellation (shadow mode)",
+                "Dark pattern detection"
+            ]
+        },
+        "negotiation": {
+            "available": True,
+            "features": [
+                "Professional script generation",
+                "Medical bill disputes",
+                "Subscription cancellations",
+                "Price negotiations"
+            ]
+        }
+    },
+    "safety_features": {
+        "shadow_mode": True,
+        "human_approval_required": True,
+        "audit_trail": True
+    }
+})
+
+@router.get("/advocate/summary", response_model=None)
+async def get_advocate_summary():
+    """Get summary of Advocate module capabilities"""
+    return Response(content=_ADVOCATE_SUMMARY_BYTES, media_type="application/json")
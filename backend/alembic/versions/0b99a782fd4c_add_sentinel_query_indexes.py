@@ -0,0 +1,49 @@
+"""Add Sentinel query indexes
+
+Revision ID: 0b99a782fd4c
+Revises: 468f79c406f7
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b99a782fd4c'
+down_revision: Union[str, Sequence[str], None] = '468f79c406f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # security_logs / pending_approvals are created by create_all on startup,
+    # so they may not exist yet on a fresh database
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'security_logs' in tables:
+        op.create_index(
+            'ix_security_logs_event_type_timestamp',
+            'security_logs',
+            ['event_type', sa.text('timestamp DESC')],
+            unique=False,
+            if_not_exists=True
+        )
+    if 'pending_approvals' in tables:
+        op.create_index(
+            'ix_pending_approvals_open',
+            'pending_approvals',
+            ['security_log_id'],
+            unique=False,
+            sqlite_where=sa.text('decision IS NULL'),
+            postgresql_where=sa.text('decision IS NULL'),
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pending_approvals_open', table_name='pending_approvals', if_exists=True)
+    op.drop_index('ix_security_logs_event_type_timestamp', table_name='security_logs', if_exists=True)
@@ -0,0 +1,42 @@
+"""Add audit anchors
+
+Revision ID: 3d8f4b6c2e71
+Revises: 7c1e5d2a9f30
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8f4b6c2e71'
+down_revision: Union[str, Sequence[str], None] = '7c1e5d2a9f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('audit_anchors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('poa_id', sa.Integer(), nullable=False),
+    sa.Column('merkle_root', sa.String(length=64), nullable=False),
+    sa.Column('leaf_count', sa.Integer(), nullable=False),
+    sa.Column('last_log_id', sa.Integer(), nullable=True),
+    sa.Column('signature', sa.String(length=256), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['poa_id'], ['smart_poas.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_anchors_id'), 'audit_anchors', ['id'], unique=False)
+    op.create_index(op.f('ix_audit_anchors_poa_id'), 'audit_anchors', ['poa_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_audit_anchors_poa_id'), table_name='audit_anchors')
+    op.drop_index(op.f('ix_audit_anchors_id'), table_name='audit_anchors')
+    op.drop_table('audit_anchors')
@@ -0,0 +1,32 @@
+"""Add audit log hash chain
+
+Revision ID: 7c1e5d2a9f30
+Revises: 0b99a782fd4c
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5d2a9f30'
+down_revision: Union[str, Sequence[str], None] = '0b99a782fd4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows stay unchained (NULL); each POA's chain starts at its next log
+    op.add_column('audit_logs', sa.Column('prev_hash', sa.String(length=64), nullable=True))
+    op.add_column('audit_logs', sa.Column('curr_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('audit_logs') as batch_op:
+        batch_op.drop_column('curr_hash')
+        batch_op.drop_column('prev_hash')
@@ -0,0 +1,42 @@
+"""Add Proxy query indexes
+
+Revision ID: 9a4b2c7d1e58
+Revises: 3d8f4b6c2e71
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4b2c7d1e58'
+down_revision: Union[str, Sequence[str], None] = '3d8f4b6c2e71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_audit_poa_ts',
+        'audit_logs',
+        ['poa_id', sa.text('timestamp DESC')],
+        unique=False,
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_bg_status_advocate',
+        'break_glass_events',
+        ['status', 'advocate_id'],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bg_status_advocate', table_name='break_glass_events', if_exists=True)
+    op.drop_index('ix_audit_poa_ts', table_name='audit_logs', if_exists=True)
@@ -0,0 +1,45 @@
+"""Make audit chain links unique per POA
+
+Revision ID: a7d2e9c4f186
+Revises: f1a6c3d8b527
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e9c4f186'
+down_revision: Union[str, Sequence[str], None] = 'f1a6c3d8b527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Chains forked by concurrent writers before this constraint can't be
+    # repaired without rewriting signed history; name them instead of failing
+    # on an opaque IntegrityError
+    forked = op.get_bind().execute(sa.text(
+        "SELECT DISTINCT poa_id FROM audit_logs WHERE prev_hash IS NOT NULL "
+        "GROUP BY poa_id, prev_hash HAVING COUNT(*) > 1"
+    )).scalars().all()
+    if forked:
+        raise RuntimeError(
+            f"Audit chains of POAs {sorted(forked)} are forked; seal and archive them before upgrading"
+        )
+    op.create_index(
+        'uq_audit_poa_prev_hash',
+        'audit_logs',
+        ['poa_id', 'prev_hash'],
+        unique=True,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_audit_poa_prev_hash', table_name='audit_logs', if_exists=True)
@@ -0,0 +1,36 @@
+"""Add partial index for active POA lookups
+
+Revision ID: c4e7a1b9d203
+Revises: 9a4b2c7d1e58
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a1b9d203'
+down_revision: Union[str, Sequence[str], None] = '9a4b2c7d1e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_smartpoa_senior_active',
+        'smart_poas',
+        ['senior_id', 'expiry_date'],
+        unique=False,
+        postgresql_where=sa.text('is_active IS true AND revoked_at IS NULL'),
+        sqlite_where=sa.text('is_active IS 1 AND revoked_at IS NULL'),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_smartpoa_senior_active', table_name='smart_poas', if_exists=True)
@@ -0,0 +1,59 @@
+"""Store encrypted tokens as binary
+
+Revision ID: e5b3f8a2c914
+Revises: c4e7a1b9d203
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+import base64
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b3f8a2c914'
+down_revision: Union[str, Sequence[str], None] = 'c4e7a1b9d203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SELECT_TOKENS = sa.text('SELECT id, encrypted_token FROM encrypted_tokens')
+_UPDATE_TOKEN = sa.text('UPDATE encrypted_tokens SET encrypted_token = :token WHERE id = :id')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    # Fernet tokens were stored as their base64 text; keep the decoded bytes
+    rows = conn.execute(_SELECT_TOKENS).fetchall()
+    
+    with op.batch_alter_table('encrypted_tokens') as batch_op:
+        batch_op.alter_column(
+            'encrypted_token',
+            existing_type=sa.Text(),
+            type_=sa.LargeBinary(),
+            existing_nullable=False,
+            postgresql_using="convert_to(encrypted_token, 'UTF8')"
+        )
+    
+    for token_id, token in rows:
+        conn.execute(_UPDATE_TOKEN, {'token': base64.urlsafe_b64decode(token), 'id': token_id})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    rows = conn.execute(_SELECT_TOKENS).fetchall()
+    
+    with op.batch_alter_table('encrypted_tokens') as batch_op:
+        batch_op.alter_column(
+            'encrypted_token',
+            existing_type=sa.LargeBinary(),
+            type_=sa.Text(),
+            existing_nullable=False,
+            postgresql_using="convert_from(encrypted_token, 'UTF8')"
+        )
+    
+    for token_id, token in rows:
+        conn.execute(_UPDATE_TOKEN, {'token': base64.urlsafe_b64encode(token).decode(), 'id': token_id})
@@ -0,0 +1,53 @@
+"""Cover created_at in the open pending approvals index
+
+Revision ID: f1a6c3d8b527
+Revises: e5b3f8a2c914
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a6c3d8b527'
+down_revision: Union[str, Sequence[str], None] = 'e5b3f8a2c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pending_approvals is created by create_all on startup (with the covering
+    # index already), so it may not exist yet on a fresh database
+    if 'pending_approvals' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    # SQLite only treats a partial index as covering when it holds the WHERE column too
+    op.drop_index('ix_pending_approvals_open', table_name='pending_approvals', if_exists=True)
+    op.create_index(
+        'ix_pending_approvals_open',
+        'pending_approvals',
+        ['security_log_id', 'created_at', 'decision'],
+        unique=False,
+        sqlite_where=sa.text('decision IS NULL'),
+        postgresql_where=sa.text('decision IS NULL'),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'pending_approvals' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_index('ix_pending_approvals_open', table_name='pending_approvals', if_exists=True)
+    op.create_index(
+        'ix_pending_approvals_open',
+        'pending_approvals',
+        ['security_log_id'],
+        unique=False,
+        sqlite_where=sa.text('decision IS NULL'),
+        postgresql_where=sa.text('decision IS NULL'),
+        if_not_exists=True
+    )
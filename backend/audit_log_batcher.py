@@ -0,0 +1,105 @@
+"""
+Batched AuditLog writer for the Proxy gatekeeper path
+Coalesces audit inserts from concurrent worker threads into one transaction
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from proxy_vault import append_audit_logs
+
+
+class AuditLogBatcher:
+    """
+    Queue signed AuditLog rows and write them in batches.
+
+    A writer thread drains the queue whenever it holds max_batch rows or
+    max_delay seconds after the first queued row, links each row into its
+    POA's hash chain and inserts the whole batch in a single transaction
+    (one fsync instead of one per row). Callers block until their batch has
+    committed and get the row's primary key, so an audit entry is durable
+    before the request that produced it returns.
+    """
+
+    def __init__(self, engine, max_batch: int = 500, max_delay: float = 0.005):
+        """
+        Args:
+            engine: Sync SQLAlchemy engine the logs are written to
+            max_batch: Flush once this many rows are queued
+            max_delay: Longest a queued row waits for companions (seconds)
+        """
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the writer thread"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-log-batcher", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Flush whatever is queued, then stop the writer thread"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, values: Dict, message: bytes) -> int:
+        """
+        Queue one AuditLog row and wait for its id
+
+        values holds every column except prev_hash/curr_hash, which are
+        filled in from message (the signed bytes) when the batch is written.
+        """
+        if self._thread is None:
+            self.start()
+        future: Future = Future()
+        self._queue.put((values, message, future))
+        return future.result()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch: List[Tuple[Dict, bytes, Future]] = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[Dict, bytes, Future]]):
+        try:
+            with self.engine.begin() as conn:
+                ids = append_audit_logs(conn, [(values, message) for values, message, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), log_id in zip(batch, ids):
+            if not future.done():
+                future.set_result(log_id)
@@ -25,22 +25,14 @@ from datetime import datetime
 from virtual_card_manager import VirtualCardManager, AuthDecision
 from transaction_governor import ContextAwareGovernor
 from models import Base, SecurityLog, PendingApproval
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from db import engine, SessionLocal
 
 # Initialize components
 card_manager = VirtualCardManager(provider="lithic")
 sentinel_governor = ContextAwareGovernor()
 
-# Database setup
-SENTINEL_DB_URL = "sqlite:///./data/aegis_trust_vault.db"
-engine = create_engine(
-    SENTINEL_DB_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=None
-)
+# Database setup (shared pooled engine from db.py: WAL, synchronous=NORMAL, busy timeout)
 Base.metadata.create_all(bind=engine)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 app = FastAPI(title="Aegis Virtual Card Authorization Service")
 
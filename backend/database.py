@@ -1,6 +1,7 @@
 import sqlite3
 import os
 from pydantic import BaseModel
+from sqlalchemy import event
 
 # Support environment variable for database path
 DB_PATH = os.getenv(
@@ -8,9 +9,43 @@ DB_PATH = os.getenv(
     os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "trust_vault.db")
 ).replace("sqlite:///", "")
 
+# Per-connection PRAGMAs shared by the raw sqlite3 helpers and SQLAlchemy engines
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+)
+
+def _configure_conn(conn):
+    """Apply per-connection PRAGMAs (WAL is persistent and set in init_db)."""
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def enable_sqlite_pragmas(engine):
+    """
+    Run WAL + SQLITE_PRAGMAS on every new connection an engine opens.
+    
+    Pass ``async_engine.sync_engine`` for async engines. No-op for other dialects.
+    """
+    if engine.dialect.name != "sqlite":
+        return engine
+    
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+    
+    return engine
+
 def get_db_connection():
     """Get database connection with row factory."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _configure_conn(sqlite3.connect(DB_PATH))
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -28,6 +63,8 @@ def init_db():
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     
     conn = get_db_connection()
+    # WAL lets the steward readers run while a bill is being written
+    conn.execute("PRAGMA journal_mode=WAL")
     c = conn.cursor()
     
     # User Credentials for the Advocate to use
@@ -0,0 +1,103 @@
+"""
+Shared SQLAlchemy engines for the Trust Vault database
+One connection pool (and one PRAGMA setup) per driver for every router
+"""
+import os
+from functools import lru_cache
+
+import orjson
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from database import enable_sqlite_pragmas
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/aegis_trust_vault.db")
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+# Async driver per dialect for the async engine
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def _async_url(url: str) -> str:
+    """DATABASE_URL with its dialect's async driver (sqlite+aiosqlite, postgresql+asyncpg)"""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in _ASYNC_DRIVERS:
+        raise RuntimeError(
+            f"DATABASE_URL dialect '{dialect}' has no async driver; use sqlite or postgresql"
+        )
+    return f"{dialect}+{_ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+def _driver_missing(error: ImportError) -> RuntimeError:
+    # Routers are imported under "except ImportError" in main.py; a missing
+    # driver must surface as an error instead of silently dropping them
+    return RuntimeError(f"Database driver for DATABASE_URL is not installed: {error}")
+
+
+def _json_serializer(value) -> str:
+    # JSON columns (audit request_details, log metadata, ...) go through orjson
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+try:
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False} if IS_SQLITE else {},
+        poolclass=QueuePool,  # reuse connections (and their statement cache) across requests
+        pool_size=10,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,  # retire connections before server-side idle timeouts drop them
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads
+    )
+except ImportError as e:
+    raise _driver_missing(e) from e
+enable_sqlite_pragmas(engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """
+    Engine for the async (Sentinel) handlers, created on first use
+    
+    Async handlers use an async driver so commits never block the event
+    loop. Building it lazily keeps that driver (asyncpg on PostgreSQL) out
+    of deployments that never serve a Sentinel route.
+    """
+    try:
+        async_engine = create_async_engine(
+            _async_url(DATABASE_URL),
+            pool_pre_ping=True,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads
+        )
+    except ImportError as e:
+        raise _driver_missing(e) from e
+    enable_sqlite_pragmas(async_engine.sync_engine)
+    return async_engine
+
+
+@lru_cache(maxsize=None)
+def _async_session_factory() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False)
+
+
+# Dependencies
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with _async_session_factory()() as db:
+        yield db
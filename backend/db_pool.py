@@ -0,0 +1,55 @@
+"""
+Process-wide SQLite connection pool for the legacy steward tables
+Reuses warm, PRAGMA-configured connections instead of reconnecting per call
+"""
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+from database import DB_PATH, _configure_conn
+
+POOL_SIZE = 5
+
+# Compiled statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# LIFO keeps the most recently used (warmest) connection at the front
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+
+
+def _new_connection():
+    """Open a connection that may be handed between worker threads."""
+    # Rows stay plain tuples; callers map them onto their own column keys
+    return _configure_conn(sqlite3.connect(
+        DB_PATH, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+    ))
+
+
+@contextmanager
+def get_conn(write=False):
+    """
+    Borrow a pooled connection.
+
+    Commits when the block exits cleanly and rolls back on error. Connections
+    opened beyond POOL_SIZE under load are closed instead of being returned.
+    With write=True the transaction starts as BEGIN IMMEDIATE, so the write
+    lock is taken up front instead of failing to upgrade mid-transaction.
+    """
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _new_connection()
+
+    try:
+        if write:
+            conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
@@ -2,7 +2,7 @@
 SQLAlchemy Models for Project Aegis Trust Vault
 Blockchain-ready audit trail for all security events
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -10,7 +10,7 @@ Base = declarative_base()
 
 # Import Module C models to register with Base
 try:
-    from proxy_models import SmartPOA, EncryptedToken, AuditLog, BreakGlassEvent, CredentialPresentation
+    from proxy_models import SmartPOA, EncryptedToken, AuditLog, AuditAnchor, BreakGlassEvent, CredentialPresentation
 except ImportError:
     pass  # Module C not yet available
 
@@ -54,11 +54,40 @@ class SecurityLog(Base):
         return f"<SecurityLog(id={self.id}, type={self.event_type}, timestamp={self.timestamp})>"
 
 
+# Lets "WHERE event_type = ? ORDER BY timestamp DESC LIMIT n" walk the index
+Index("ix_security_logs_event_type_timestamp", SecurityLog.event_type, SecurityLog.timestamp.desc())
+
+# Columns returned by the /sentinel/logs audit listing
+SECURITY_LOG_SUMMARY_COLUMNS = (
+    SecurityLog.id,
+    SecurityLog.event_type,
+    SecurityLog.timestamp,
+    SecurityLog.fraud_score,
+    SecurityLog.risk_level,
+    SecurityLog.action_taken,
+    SecurityLog.approval_status,
+    SecurityLog.advocate_notified,
+)
+
+
 class PendingApproval(Base):
     """
     Pending approvals requiring Trusted Advocate review
     """
     __tablename__ = "pending_approvals"
+    __table_args__ = (
+        # Partial index: only open (undecided) approvals are indexed, so the
+        # pending queue scan stays proportional to the queue, not the history.
+        # created_at/decision ride along so the queue is read from the index alone
+        Index(
+            "ix_pending_approvals_open",
+            "security_log_id",
+            "created_at",
+            "decision",
+            sqlite_where=text("decision IS NULL"),
+            postgresql_where=text("decision IS NULL"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     security_log_id = Column(Integer, nullable=False, index=True)
@@ -70,3 +99,16 @@ class PendingApproval(Base):
     
     def __repr__(self):
         return f"<PendingApproval(id={self.id}, log_id={self.security_log_id}, decision={self.decision})>"
+
+
+# Columns returned by the pending-approvals queue (approval joined to its log)
+PENDING_APPROVAL_COLUMNS = (
+    PendingApproval.id,
+    PendingApproval.created_at,
+    SecurityLog.transaction_amount,
+    SecurityLog.merchant,
+    SecurityLog.transaction_category,
+    SecurityLog.transaction_time,
+    SecurityLog.risk_level,
+    SecurityLog.reasoning,
+)
@@ -0,0 +1,97 @@
+"""
+Shared cache of POA authorization state for the Token Gatekeeper
+Lets repeated validations skip the POA SELECT; the audit log is still written
+"""
+import os
+from datetime import datetime
+from typing import Optional
+
+import orjson
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from proxy_models import SmartPOA
+
+# Longest a POA snapshot is served (seconds); it never outlives the POA's expiry
+POA_CACHE_TTL = 60
+
+# Everything validate_request decides on
+_FIELDS = (
+    "id", "senior_id", "agent_id", "scope", "specific_services", "spend_limit",
+    "expiry_date", "revoked_at", "is_active"
+)
+_DATETIME_FIELDS = ("expiry_date", "revoked_at")
+
+# Written over an invalidated POA's snapshot; while it lives, reads miss and
+# puts (SET NX) are refused
+_TOMBSTONE = b""
+
+
+class POAStateCache:
+    """
+    Redis-backed snapshots of SmartPOA authorization fields
+
+    Snapshots come back as transient SmartPOA objects (never added to a
+    session), so is_valid/is_within_scope/is_within_limit work unchanged.
+    Revocation must call invalidate(), which leaves a tombstone for one TTL
+    instead of deleting the key: a validation that read the POA before the
+    revocation committed can't put its stale snapshot back. Redis being
+    unreachable falls back to the database.
+    """
+
+    def __init__(self, client, ttl: int = POA_CACHE_TTL):
+        self.client = client
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> Optional["POAStateCache"]:
+        """Cache on REDIS_URL, or None when unset or redis isn't installed"""
+        url = os.getenv("REDIS_URL")
+        if not url:
+            return None
+        if not REDIS_AVAILABLE:
+            print("⚠️  REDIS_URL is set but redis is not installed. Run: pip install redis")
+            return None
+        return cls(redis.Redis.from_url(url))
+
+    @staticmethod
+    def _key(poa_id: int) -> str:
+        return f"poa:{poa_id}"
+
+    def get(self, poa_id: int) -> Optional[SmartPOA]:
+        """Cached POA snapshot, or None on a miss"""
+        try:
+            raw = self.client.get(self._key(poa_id))
+        except redis.RedisError:
+            return None
+        if raw is None or raw == _TOMBSTONE:
+            return None
+
+        data = orjson.loads(raw)
+        for field in _DATETIME_FIELDS:
+            if data[field] is not None:
+                data[field] = datetime.fromisoformat(data[field])
+        return SmartPOA(**data)
+
+    def put(self, poa: SmartPOA):
+        """Cache a POA until the TTL or its expiry, whichever comes first (never over a tombstone)"""
+        ttl = min(self.ttl, int((poa.expiry_date - datetime.utcnow()).total_seconds()))
+        if ttl <= 0:
+            return
+        try:
+            self.client.set(
+                self._key(poa.id), orjson.dumps({field: getattr(poa, field) for field in _FIELDS}), ex=ttl, nx=True
+            )
+        except redis.RedisError:
+            pass
+
+    def invalidate(self, poa_id: int):
+        """Replace a POA's snapshot with a tombstone (after revocation or any other change)"""
+        try:
+            self.client.set(self._key(poa_id), _TOMBSTONE, ex=self.ttl)
+        except redis.RedisError:
+            print(f"⚠️  Could not invalidate cached POA {poa_id}; it may be served for up to {self.ttl}s")
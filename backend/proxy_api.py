@@ -2,8 +2,9 @@
 Module C: The Proxy - FastAPI Endpoints
 Digital POA Vault, Token Gatekeeper, Break-Glass Protocol, and Audit Trail
 """
-from fastapi import APIRouter, HTTPException, Depends, Response
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -12,30 +13,46 @@ from proxy_models import SmartPOA, EncryptedToken, AuditLog, BreakGlassEvent
 from proxy_vault import SmartPOAManager, TokenGatekeeper, CredentialPresenter
 from proxy_break_glass import BreakGlassMonitor
 from proxy_audit import FiduciaryLogger, LegalExporter
-from models import Base
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from audit_log_batcher import AuditLogBatcher
+from poa_cache import POAStateCache
+from db import engine, get_db
 import os
-
-# Database setup
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/aegis_trust_vault.db")
-engine = create_engine(
-    DATABASE_URL.replace("sqlite:///", "sqlite:///"),
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    poolclass=None
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+import zipfile
+from io import BytesIO
 
 # Router
-router = APIRouter(prefix="/proxy", tags=["Module C - The Proxy"])
+router = APIRouter(prefix="/proxy", tags=["Module C - The Proxy"], default_response_class=ORJSONResponse)
+
+# Opt-in (BATCH_AUDIT_LOGS=1): group-commit gatekeeper audit logs across
+# concurrent requests. Each request still waits for its own log to commit.
+audit_log_batcher = AuditLogBatcher(engine) if os.getenv("BATCH_AUDIT_LOGS") == "1" else None
+
+# Opt-in (REDIS_URL): validations read POA state from Redis, not the database
+poa_cache = POAStateCache.from_env()
+
+# PDF downloads are sent in slices of this size
+PDF_CHUNK_SIZE = 64 * 1024
+
+# Most POAs one bulk audit export may cover
+MAX_BULK_EXPORT_POAS = 100
+
+
+def _pdf_response(pdf_data: bytes, filename: str, media_type: str = "application/pdf") -> StreamingResponse:
+    """Stream a rendered PDF (or archive of them) in PDF_CHUNK_SIZE slices"""
+    async def chunks():
+        # Async generator: Starlette iterates it on the event loop instead of
+        # hopping to the threadpool for every slice
+        for start in range(0, len(pdf_data), PDF_CHUNK_SIZE):
+            yield pdf_data[start:start + PDF_CHUNK_SIZE]
+    
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(len(pdf_data))
+        }
+    )
 
 
 # ============================================================================
@@ -60,6 +77,18 @@ class StoreTokenRequest(BaseModel):
     expires_in_seconds: Optional[int] = None
 
 
+class TokenEntry(BaseModel):
+    service_name: str
+    token: str
+    token_type: str = "access"
+    expires_in_seconds: Optional[int] = None
+
+
+class BatchStoreTokenRequest(BaseModel):
+    poa_id: int
+    tokens: List[TokenEntry] = Field(min_length=1)
+
+
 class ValidateRequestModel(BaseModel):
     poa_id: int
     service_name: str
@@ -84,6 +113,34 @@ class DenyBreakGlassRequest(BaseModel):
     reason: str
 
 
+class AuditLogEntry(BaseModel):
+    poa_id: int
+    action_type: str
+    decision: str
+    reasoning: str
+    request_details: Dict[str, Any] = {}
+    service_name: Optional[str] = None
+    amount: Optional[float] = None
+    advocate_notified: bool = False
+
+
+class BatchAuditLogRequest(BaseModel):
+    entries: List[AuditLogEntry] = Field(min_length=1)
+
+
+class BulkExportRequest(BaseModel):
+    poa_ids: List[int]
+
+
+# Clients may only record actions taken under a POA. Gatekeeper verdicts
+# (SCOPE_VIOLATION, BREAK_GLASS, ...) and POA lifecycle entries are written
+# by the server alone, and every client entry is stamped with its source
+# inside the signed request_details.
+CLIENT_AUDIT_ACTION_TYPES = frozenset({"TOKEN_USE", "TRANSACTION"})
+CLIENT_AUDIT_DECISIONS = frozenset({"ALLOWED", "BLOCKED"})
+CLIENT_AUDIT_SOURCE = "client_batch"
+
+
 # ============================================================================
 # VAULT ENDPOINTS
 # ============================================================================
@@ -95,7 +152,7 @@ def create_smart_poa(request: CreatePOARequest, db: Session = Depends(get_db)):
     
     Example: "Agent can negotiate AT&T bill, max $100, expires in 30 days"
     """
-    manager = SmartPOAManager(db)
+    manager = SmartPOAManager(db, audit_log_batcher)
     
     poa = manager.create_poa(
         senior_id=request.senior_id,
@@ -114,7 +171,7 @@ def create_smart_poa(request: CreatePOARequest, db: Session = Depends(get_db)):
         "agent_id": poa.agent_id,
         "scope": poa.scope,
         "spend_limit": poa.spend_limit,
-        "expiry_date": poa.expiry_date.isoformat(),
+        "expiry_date": poa.expiry_date,
         "is_active": poa.is_active,
         "message": f"Smart POA created successfully. Valid until {poa.expiry_date.strftime('%Y-%m-%d')}"
     }
@@ -136,11 +193,11 @@ def get_poa(poa_id: int, db: Session = Depends(get_db)):
         "scope": poa.scope,
         "spend_limit": poa.spend_limit,
         "specific_services": poa.specific_services,
-        "expiry_date": poa.expiry_date.isoformat(),
-        "created_at": poa.created_at.isoformat(),
+        "expiry_date": poa.expiry_date,
+        "created_at": poa.created_at,
         "is_active": poa.is_active,
         "is_valid": poa.is_valid(),
-        "revoked_at": poa.revoked_at.isoformat() if poa.revoked_at else None,
+        "revoked_at": poa.revoked_at,
         "revocation_reason": poa.revocation_reason
     }
 
@@ -148,7 +205,7 @@ def get_poa(poa_id: int, db: Session = Depends(get_db)):
 @router.delete("/vault/poa/{poa_id}")
 def revoke_poa(poa_id: int, reason: str, revoked_by: str, db: Session = Depends(get_db)):
     """Revoke a POA"""
-    manager = SmartPOAManager(db)
+    manager = SmartPOAManager(db, audit_log_batcher, poa_cache)
     success = manager.revoke_poa(poa_id, reason, revoked_by)
     
     if not success:
@@ -176,7 +233,7 @@ def get_poas_by_senior(senior_id: str, active_only: bool = True, db: Session = D
                 "agent_id": poa.agent_id,
                 "scope": poa.scope,
                 "spend_limit": poa.spend_limit,
-                "expiry_date": poa.expiry_date.isoformat(),
+                "expiry_date": poa.expiry_date,
                 "is_valid": poa.is_valid()
             }
             for poa in poas
@@ -206,25 +263,43 @@ def store_oauth_token(request: StoreTokenRequest, db: Session = Depends(get_db))
         "token_id": token_record.id,
         "poa_id": token_record.poa_id,
         "service_name": token_record.service_name,
-        "expires_at": token_record.expires_at.isoformat() if token_record.expires_at else None,
-        "message": "Token stored securely with Fernet encryption"
+        "expires_at": token_record.expires_at,
+        "message": "Token stored securely with AES-256-GCM encryption"
+    }
+
+
+@router.post("/tokens/store/batch")
+def store_oauth_tokens_batch(request: BatchStoreTokenRequest, db: Session = Depends(get_db)):
+    """Store many encrypted OAuth tokens for one POA (e.g. a connect flow) in one transaction"""
+    if db.query(SmartPOA.id).filter(SmartPOA.id == request.poa_id).first() is None:
+        raise HTTPException(status_code=404, detail="POA not found")
+    
+    manager = SmartPOAManager(db)
+    token_ids = manager.store_oauth_tokens(request.poa_id, [entry.model_dump() for entry in request.tokens])
+    
+    return {
+        "success": True,
+        "poa_id": request.poa_id,
+        "total_tokens": len(token_ids),
+        "token_ids": token_ids
     }
 
 
 @router.post("/tokens/validate")
-def validate_request(request: ValidateRequestModel, db: Session = Depends(get_db)):
+def validate_request(request: ValidateRequestModel, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     Validate request against POA scope and limits
     
     This is the TOKEN GATEKEEPER - blocks unauthorized access
     """
-    gatekeeper = TokenGatekeeper(db)
+    gatekeeper = TokenGatekeeper(db, audit_log_batcher, poa_cache)
     
     result = gatekeeper.validate_request(
         poa_id=request.poa_id,
         service_name=request.service_name,
         amount=request.amount,
-        action=request.action
+        action=request.action,
+        background_tasks=background_tasks
     )
     
     # If break-glass triggered, create event
@@ -239,7 +314,8 @@ def validate_request(request: ValidateRequestModel, db: Session = Depends(get_db
                 "spend_limit": result["poa"].spend_limit
             },
             advocate_id=os.getenv("TRUSTED_ADVOCATE_EMAIL", "advocate@example.com"),
-            require_liveness=request.amount and request.amount > 500  # Liveness for >$500
+            require_liveness=request.amount and request.amount > 500,  # Liveness for >$500
+            background_tasks=background_tasks
         )
         
         result["break_glass_event_id"] = event.id
@@ -326,8 +402,8 @@ def get_pending_break_glass(advocate_id: Optional[str] = None, db: Session = Dep
                 "event_id": event.id,
                 "trigger_reason": event.trigger_reason,
                 "status": event.status,
-                "created_at": event.created_at.isoformat(),
-                "expires_at": event.expires_at.isoformat(),
+                "created_at": event.created_at,
+                "expires_at": event.expires_at,
                 "liveness_required": event.liveness_required,
                 "two_fa_verified": event.two_fa_verified_at is not None
             }
@@ -359,7 +435,7 @@ def get_audit_logs(
             {
                 "log_id": log.id,
                 "action_type": log.action_type,
-                "timestamp": log.timestamp.isoformat(),
+                "timestamp": log.timestamp,
                 "decision": log.decision,
                 "reasoning": log.reasoning,
                 "service_name": log.service_name,
@@ -372,27 +448,106 @@ def get_audit_logs(
     }
 
 
+@router.post("/audit/logs/batch")
+def create_audit_logs_batch(request: BatchAuditLogRequest, db: Session = Depends(get_db)):
+    """
+    Record many client-reported audit log entries in a single transaction
+    
+    Only CLIENT_AUDIT_ACTION_TYPES / CLIENT_AUDIT_DECISIONS are accepted;
+    each entry's request_details gets source=CLIENT_AUDIT_SOURCE.
+    """
+    for field, allowed in (("action_type", CLIENT_AUDIT_ACTION_TYPES), ("decision", CLIENT_AUDIT_DECISIONS)):
+        rejected = {getattr(entry, field) for entry in request.entries} - allowed
+        if rejected:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{field} not allowed: {sorted(rejected)} (allowed: {sorted(allowed)})"
+            )
+    
+    poa_ids = {entry.poa_id for entry in request.entries}
+    known = {poa_id for (poa_id,) in db.query(SmartPOA.id).filter(SmartPOA.id.in_(poa_ids))}
+    missing = poa_ids - known
+    if missing:
+        raise HTTPException(status_code=404, detail=f"POA not found: {sorted(missing)}")
+    
+    logger = FiduciaryLogger(db)
+    log_ids = logger.create_logs_bulk([
+        {**entry.model_dump(), "request_details": {**entry.request_details, "source": CLIENT_AUDIT_SOURCE}}
+        for entry in request.entries
+    ])
+    
+    return {
+        "success": True,
+        "total_logs": len(log_ids),
+        "log_ids": log_ids
+    }
+
+
+@router.get("/audit/chain/{poa_id}")
+def verify_audit_chain(poa_id: int, db: Session = Depends(get_db)):
+    """Verify the hash chain over a POA's audit trail"""
+    logger = FiduciaryLogger(db)
+    return logger.verify_chain(poa_id)
+
+
+@router.post("/audit/anchor/{poa_id}")
+def anchor_audit_trail(poa_id: int, db: Session = Depends(get_db)):
+    """Seal the POA's audit trail under a signed Merkle root"""
+    logger = FiduciaryLogger(db)
+    anchor = logger.build_merkle_root(poa_id)
+    
+    return {
+        "anchor_id": anchor.id,
+        "poa_id": poa_id,
+        "merkle_root": anchor.merkle_root,
+        "leaf_count": anchor.leaf_count,
+        "last_log_id": anchor.last_log_id,
+        "signature": anchor.signature
+    }
+
+
 @router.get("/audit/export/{poa_id}")
 def export_audit_trail(poa_id: int, format: str = "json", db: Session = Depends(get_db)):
     """Export audit trail (JSON or PDF)"""
     if format == "json":
         logger = FiduciaryLogger(db)
-        json_data = logger.export_logs_json(poa_id)
-        return Response(content=json_data, media_type="application/json")
+        return StreamingResponse(logger.iter_logs_json(poa_id), media_type="application/json")
     
     elif format == "pdf":
         exporter = LegalExporter(db)
         pdf_data = exporter.generate_audit_trail_pdf(poa_id)
-        return Response(
-            content=pdf_data,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=audit_trail_poa_{poa_id}.pdf"}
-        )
+        return _pdf_response(pdf_data, f"audit_trail_poa_{poa_id}.pdf")
     
     else:
         raise HTTPException(status_code=400, detail="Format must be 'json' or 'pdf'")
 
 
+@router.post("/audit/export/bulk")
+def export_audit_trails_bulk(request: BulkExportRequest, db: Session = Depends(get_db)):
+    """Export audit trail PDFs for several POAs as one ZIP archive"""
+    if not request.poa_ids:
+        raise HTTPException(status_code=400, detail="poa_ids must not be empty")
+    if len(request.poa_ids) > MAX_BULK_EXPORT_POAS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_EXPORT_POAS} POAs per bulk export"
+        )
+    
+    exporter = LegalExporter(db)
+    try:
+        pdfs = exporter.generate_audit_trail_pdfs_bulk(request.poa_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    # PDFs are already compressed; store them as-is
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for poa_id, pdf_data in pdfs.items():
+            archive.writestr(f"audit_trail_poa_{poa_id}.pdf", pdf_data)
+    
+    return _pdf_response(buffer.getvalue(), "audit_trails.zip", media_type="application/zip")
+
+
 @router.post("/audit/verify/{log_id}")
 def verify_audit_log(log_id: int, db: Session = Depends(get_db)):
     """Verify audit log signature"""
@@ -417,11 +572,7 @@ def generate_poa_certificate(poa_id: int, db: Session = Depends(get_db)):
     
     try:
         pdf_data = exporter.generate_poa_certificate_pdf(poa_id)
-        return Response(
-            content=pdf_data,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=poa_certificate_{poa_id}.pdf"}
-        )
+        return _pdf_response(pdf_data, f"poa_certificate_{poa_id}.pdf")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -437,7 +588,7 @@ def present_credentials(poa_id: int, presented_to: str, method: str = "PDF", db:
         "presentation_id": presentation.id,
         "verification_code": presentation.verification_code,
         "presented_to": presented_to,
-        "presented_at": presentation.presented_at.isoformat(),
+        "presented_at": presentation.presented_at,
         "message": f"Credentials presented to {presented_to}"
     }
 
@@ -467,7 +618,7 @@ def get_proxy_summary():
             "token_gatekeeper": {
                 "available": True,
                 "features": [
-                    "Fernet encrypted token storage",
+                    "AES-256-GCM encrypted token storage",
                     "Scope validation",
                     "Spend limit enforcement",
                     "Automatic blocking of unauthorized requests"
@@ -486,7 +637,7 @@ def get_proxy_summary():
             "audit_trail": {
                 "available": True,
                 "features": [
-                    "Cryptographically signed logs (HMAC-SHA256)",
+                    "Cryptographically signed logs (keyed BLAKE2b)",
                     "Immutable fiduciary proof",
                     "PDF export for legal authorities",
                     "Signature verification",
@@ -504,8 +655,8 @@ def get_proxy_summary():
             }
         },
         "security_features": {
-            "encryption": "Fernet (symmetric)",
-            "signatures": "HMAC-SHA256",
+            "encryption": "AES-256-GCM (legacy Fernet decrypted)",
+            "signatures": "Keyed BLAKE2b (legacy HMAC-SHA256 verified)",
             "2fa": "TOTP (Time-based OTP)",
             "liveness": "Face/Voice verification",
             "notifications": "Push, SMS, Email"
@@ -3,21 +3,231 @@ Module C: The Proxy - Audit Trail & Fiduciary Proof
 Legal-grade logging with cryptographic signatures
 """
 import os
-import json
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session, sessionmaker
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib import colors
 from io import BytesIO
+from textwrap import wrap
 import base64
+import orjson
+from functools import lru_cache
 
-from proxy_models import AuditLog, SmartPOA, BreakGlassEvent
-from proxy_vault import VaultEncryption, CredentialPresenter
+from proxy_models import AuditLog, AuditAnchor, SmartPOA, BreakGlassEvent
+from proxy_vault import (
+    CredentialPresenter, GENESIS_HASH, get_vault_encryption, audit_message, append_audit_logs, chain_hash
+)
+
+# PDF styles are read-only once built, so every document shares them
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1a1a1a'),
+    spaceAfter=30,
+    alignment=1  # Center
+)
+_DETAILS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+])
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8e8e8')),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (1, 4), (1, 5), 7)  # 64-char Merkle root and signature
+])
+
+# Audit trail entries are laid out as tables: a row of short fields per
+# log, followed by a full-width row for the free text that has to wrap
+_AUDIT_TABLE_HEADER = ["#", "When (UTC)", "Type", "Decision", "Service", "Amount", "Notified"]
+_AUDIT_TABLE_COL_WIDTHS = [0.4*inch, 1.25*inch, 1.6*inch, 1.0*inch, 0.95*inch, 0.7*inch, 0.6*inch]  # 6.5" frame
+_AUDIT_TABLE_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8e8e8')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.grey)
+]
+# Detail rows are plain pre-wrapped strings: table cells holding Paragraphs
+# get re-wrapped on every layout pass, which costs more than the
+# Paragraph-per-log story this table replaces. Characters per line at 8pt.
+_DETAIL_LINE_WIDTH = 100
+
+# Logs per table. ReportLab re-measures a table's remaining rows every time
+# it splits one across a page, so a single 1000-log table costs quadratic
+# layout time; blocks of a couple of pages avoid that.
+AUDIT_TABLE_BLOCK = 25
+
+
+def _merkle_leaf(message: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + message).digest()
+
+
+def _merkle_levels(leaves: List[bytes]) -> List[List[bytes]]:
+    """All levels of a Merkle tree, leaves first (an unpaired node moves up as-is)"""
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [
+            hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest()
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_proof(levels: List[List[bytes]], index: int) -> List[str]:
+    """Inclusion path for a leaf: sibling hashes up to the root, tagged L/R by side"""
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(("L:" if sibling < index else "R:") + level[sibling].hex())
+        index //= 2
+    return path
+
+
+def _audit_tables(rows: List[List[Any]]) -> List[Table]:
+    """Lay out (summary row, detail row) pairs as header-topped tables of AUDIT_TABLE_BLOCK logs"""
+    step = 2 * AUDIT_TABLE_BLOCK
+    tables = []
+    for start in range(0, len(rows), step):
+        block = [_AUDIT_TABLE_HEADER] + rows[start:start + step]
+        spans = [('SPAN', (0, row), (-1, row)) for row in range(2, len(block), 2)]
+        table = Table(block, colWidths=_AUDIT_TABLE_COL_WIDTHS, repeatRows=1)
+        table.setStyle(TableStyle(_AUDIT_TABLE_COMMANDS + spans))
+        tables.append(table)
+    return tables
+
+
+def _build_pdf(story: List[Any]) -> bytes:
+    """
+    Lay out a story as a letter-size PDF
+    
+    ReportLab serializes the finished document in memory and hands it to the
+    file object in a single write(), so a plain BytesIO is already one copy.
+    """
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+
+# Rendered POA certificates kept in memory
+CERTIFICATE_CACHE_SIZE = 512
+
+
+class _Certificate(NamedTuple):
+    """Every POA field a certificate renders (also its cache key)"""
+    id: int
+    senior_id: str
+    agent_id: str
+    scope: str
+    spend_limit: float
+    created_at: datetime
+    expiry_date: datetime
+    specific_services: Optional[Tuple[str, ...]]
+    active: bool
+
+
+@lru_cache(maxsize=CERTIFICATE_CACHE_SIZE)
+def _render_certificate(cert: _Certificate) -> bytes:
+    """
+    Render a POA certificate
+    
+    Cached on the rendered fields, so repeat downloads of an unchanged POA
+    return the first rendering (its Generated line and verification code
+    included) without rebuilding the PDF.
+    """
+    story = []
+    styles = _STYLES
+    
+    # Title
+    story.append(Paragraph("SMART POWER OF ATTORNEY", _TITLE_STYLE))
+    story.append(Paragraph("Digital Credential Certificate", styles['Heading2']))
+    story.append(Spacer(1, 0.3*inch))
+    
+    # POA Details
+    details = [
+        ["Certificate ID:", str(cert.id)],
+        ["Senior ID:", cert.senior_id],
+        ["Authorized Agent:", cert.agent_id],
+        ["Scope:", cert.scope.upper()],
+        ["Spend Limit:", f"${cert.spend_limit:.2f}"],
+        ["Created:", cert.created_at.strftime("%Y-%m-%d %H:%M UTC")],
+        ["Expires:", cert.expiry_date.strftime("%Y-%m-%d %H:%M UTC")],
+        ["Status:", "ACTIVE" if cert.active else "INACTIVE"]
+    ]
+    
+    if cert.specific_services:
+        details.append(["Specific Services:", ", ".join(cert.specific_services)])
+    
+    table = Table(details, colWidths=[2*inch, 4*inch])
+    table.setStyle(_DETAILS_TABLE_STYLE)
+    story.append(table)
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Permissions
+    story.append(Paragraph("<b>Authorized Actions:</b>", styles['Heading3']))
+    permissions_text = f"""
+    This Smart POA grants the agent ({cert.agent_id}) permission to:
+    <br/>
+    • Access and manage {cert.scope} services
+    <br/>
+    • Execute transactions up to ${cert.spend_limit:.2f}
+    <br/>
+    • Valid until {cert.expiry_date.strftime("%B %d, %Y")}
+    <br/><br/>
+    <b>Restrictions:</b>
+    <br/>
+    • Transactions exceeding ${cert.spend_limit:.2f} require break-glass approval
+    <br/>
+    • Access limited to {cert.scope} scope only
+    <br/>
+    • All actions are logged with cryptographic signatures
+    """
+    story.append(Paragraph(permissions_text, styles['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Verification code (printed as text; no QR PNG is encoded for the PDF)
+    presenter = CredentialPresenter(None)  # only signs; no database access
+    verification_code = presenter.generate_verification_code(cert.id)
+    
+    story.append(Paragraph("<b>Verification QR Code:</b>", styles['Heading3']))
+    story.append(Paragraph(f"Verification Code: {verification_code}", styles['Normal']))
+    story.append(Spacer(1, 0.2*inch))
+    
+    # Legal Notice
+    legal_text = """
+    <b>LEGAL NOTICE:</b><br/>
+    This is a legally binding digital Power of Attorney credential issued under Project Aegis.
+    All actions taken under this POA are monitored, logged, and cryptographically signed for
+    legal verification. This certificate can be verified using the QR code above or by
+    contacting Project Aegis support with the Certificate ID.
+    <br/><br/>
+    Generated: {}<br/>
+    System: Project Aegis - Module C (The Proxy)
+    """.format(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"))
+    
+    story.append(Spacer(1, 0.3*inch))
+    story.append(Paragraph(legal_text, styles['Normal']))
+    
+    return _build_pdf(story)
+    
 
 
 class FiduciaryLogger:
@@ -28,7 +238,7 @@ class FiduciaryLogger:
     
     def __init__(self, db: Session):
         self.db = db
-        self.encryption = VaultEncryption()
+        self.encryption = get_vault_encryption()
     
     def create_log(
         self,
@@ -42,50 +252,160 @@ class FiduciaryLogger:
         advocate_notified: bool = False
     ) -> AuditLog:
         """Create signed audit log entry"""
-        # Create signature
-        signature_data = {
+        log_id = self._add_logs([{
             "poa_id": poa_id,
             "action_type": action_type,
-            "timestamp": datetime.utcnow().isoformat(),
             "decision": decision,
-            "request_details": request_details
-        }
-        signature = self.encryption.sign_data(signature_data)
+            "reasoning": reasoning,
+            "request_details": request_details,
+            "service_name": service_name,
+            "amount": amount,
+            "advocate_notified": advocate_notified
+        }])[0]
+        self.db.commit()
         
-        audit_log = AuditLog(
-            poa_id=poa_id,
-            action_type=action_type,
-            decision=decision,
-            reasoning=reasoning,
-            request_details=request_details,
-            service_name=service_name,
-            amount=amount,
-            signature=signature,
-            signature_verified=True,
-            advocate_notified=advocate_notified
-        )
+        return self.db.get(AuditLog, log_id)
+    
+    def create_logs_bulk(self, entries: List[Dict[str, Any]]) -> List[int]:
+        """
+        Create many signed audit log entries in one transaction
         
-        self.db.add(audit_log)
+        Each entry takes the same keys as create_log's arguments. Returns the
+        new log ids in entry order.
+        """
+        if not entries:
+            return []
+        log_ids = self._add_logs(entries)
         self.db.commit()
-        self.db.refresh(audit_log)
+        return log_ids
+    
+    def _add_logs(self, entries: List[Dict[str, Any]]) -> List[int]:
+        """Sign entries and chain them in as one multi-row INSERT (caller commits)"""
+        # The signed timestamp is stored on the row so verification can rebuild
+        # the exact same canonical bytes. One clock read per batch; chains are
+        # ordered by id, so rows sharing a timestamp stay in sequence.
+        sign = self.encryption.sign_bytes
+        timestamp = datetime.utcnow()
+        rows = []
+        for entry in entries:
+            message = audit_message(
+                entry["poa_id"], entry["action_type"], timestamp, entry["decision"], entry["request_details"]
+            )
+            rows.append(({
+                "poa_id": entry["poa_id"],
+                "action_type": entry["action_type"],
+                "timestamp": timestamp,
+                "decision": entry["decision"],
+                "reasoning": entry["reasoning"],
+                "request_details": entry["request_details"],
+                "service_name": entry.get("service_name"),
+                "amount": entry.get("amount"),
+                "signature": sign(message),
+                "signature_verified": True,
+                "advocate_notified": entry.get("advocate_notified", False)
+            }, message))
         
-        return audit_log
+        return append_audit_logs(self.db, rows)
     
     def verify_log_signature(self, log_id: int) -> bool:
-        """Verify audit log signature"""
-        log = self.db.query(AuditLog).filter(AuditLog.id == log_id).first()
+        """Verify audit log signature (repeat checks of unchanged rows hit a cache)"""
+        log = (
+            self.db.query(AuditLog)
+            .with_entities(
+                AuditLog.poa_id, AuditLog.action_type, AuditLog.timestamp,
+                AuditLog.decision, AuditLog.request_details, AuditLog.signature
+            )
+            .filter(AuditLog.id == log_id)
+            .first()
+        )
         if not log:
             return False
         
-        signature_data = {
-            "poa_id": log.poa_id,
-            "action_type": log.action_type,
-            "timestamp": log.timestamp.isoformat(),
-            "decision": log.decision,
-            "request_details": log.request_details
+        message = audit_message(log.poa_id, log.action_type, log.timestamp, log.decision, log.request_details)
+        return self.encryption.verify_bytes(message, log.signature)
+    
+    def verify_chain(self, poa_id: int) -> Dict[str, Any]:
+        """
+        Verify a POA's whole audit trail with one SHA-256 pass over the chain
+        
+        Only the resulting head is signed, as the anchor for the trail.
+        """
+        rows = (
+            self.db.query(
+                AuditLog.id, AuditLog.action_type, AuditLog.timestamp, AuditLog.decision,
+                AuditLog.request_details, AuditLog.prev_hash, AuditLog.curr_hash
+            )
+            .filter(AuditLog.poa_id == poa_id, AuditLog.curr_hash.isnot(None))
+            .order_by(AuditLog.id)
+            .yield_per(500)
+        )
+        
+        prev_hash = GENESIS_HASH
+        checked = 0
+        for row in rows:
+            message = audit_message(poa_id, row.action_type, row.timestamp, row.decision, row.request_details)
+            if row.prev_hash != prev_hash or chain_hash(prev_hash, message) != row.curr_hash:
+                return {
+                    "poa_id": poa_id,
+                    "valid": False,
+                    "entries_checked": checked,
+                    "broken_at_log_id": row.id
+                }
+            prev_hash = row.curr_hash
+            checked += 1
+        
+        return {
+            "poa_id": poa_id,
+            "valid": True,
+            "entries_checked": checked,
+            "head_hash": prev_hash,
+            "head_signature": self.encryption.sign_bytes(prev_hash.encode())
         }
+    
+    def build_merkle_root(self, poa_id: int) -> AuditAnchor:
+        """Seal the POA's current audit trail under one signed Merkle root"""
+        anchor, _, _ = self.seal_trail(poa_id)
+        return anchor
+    
+    def seal_trail(self, poa_id: int) -> Tuple[AuditAnchor, List[int], List[List[bytes]]]:
+        """
+        Build the Merkle tree over a POA's logs (in id order) and store its root
         
-        return self.encryption.verify_signature(signature_data, log.signature)
+        Returns the anchor, the log ids in leaf order and the tree levels, so
+        callers can derive inclusion paths with merkle_proof().
+        """
+        rows = (
+            self.db.query(
+                AuditLog.id, AuditLog.action_type, AuditLog.timestamp,
+                AuditLog.decision, AuditLog.request_details
+            )
+            .filter(AuditLog.poa_id == poa_id)
+            .order_by(AuditLog.id)
+            .yield_per(500)
+        )
+        
+        log_ids = []
+        leaves = []
+        for row in rows:
+            log_ids.append(row.id)
+            leaves.append(_merkle_leaf(
+                audit_message(poa_id, row.action_type, row.timestamp, row.decision, row.request_details)
+            ))
+        
+        levels = _merkle_levels(leaves)
+        merkle_root = levels[-1][0].hex() if leaves else GENESIS_HASH
+        
+        anchor = AuditAnchor(
+            poa_id=poa_id,
+            merkle_root=merkle_root,
+            leaf_count=len(leaves),
+            last_log_id=log_ids[-1] if log_ids else None,
+            signature=self.encryption.sign_bytes(merkle_root.encode())
+        )
+        self.db.add(anchor)
+        self.db.commit()
+        
+        return anchor, log_ids, levels
     
     def get_logs_by_poa(
         self,
@@ -107,30 +427,49 @@ class FiduciaryLogger:
     
     def export_logs_json(self, poa_id: int) -> str:
         """Export audit logs as JSON"""
-        logs = self.get_logs_by_poa(poa_id)
+        return b"".join(self.iter_logs_json(poa_id)).decode()
+    
+    def iter_logs_json(self, poa_id: int) -> Iterator[bytes]:
+        """
+        Export the full audit trail as JSON, one log per chunk
         
-        export_data = {
-            "poa_id": poa_id,
-            "export_timestamp": datetime.utcnow().isoformat(),
-            "total_logs": len(logs),
-            "logs": [
-                {
-                    "id": log.id,
-                    "action_type": log.action_type,
-                    "timestamp": log.timestamp.isoformat(),
-                    "decision": log.decision,
-                    "reasoning": log.reasoning,
-                    "request_details": log.request_details,
-                    "service_name": log.service_name,
-                    "amount": log.amount,
-                    "signature": log.signature,
-                    "advocate_notified": log.advocate_notified
-                }
-                for log in logs
-            ]
-        }
+        Rows are fetched 500 at a time and written out as they arrive, so
+        memory stays flat however long the trail is. total_logs comes last.
+        """
+        rows = (
+            self.db.query(
+                AuditLog.id, AuditLog.action_type, AuditLog.timestamp, AuditLog.decision,
+                AuditLog.reasoning, AuditLog.request_details, AuditLog.service_name,
+                AuditLog.amount, AuditLog.signature, AuditLog.advocate_notified
+            )
+            .filter(AuditLog.poa_id == poa_id)
+            .order_by(AuditLog.timestamp.desc())
+            .yield_per(500)
+        )
+        
+        yield b'{"poa_id":%d,"export_timestamp":%s,"logs":[' % (
+            poa_id, orjson.dumps(datetime.utcnow())
+        )
+        
+        total = 0
+        for row in rows:
+            if total:
+                yield b","
+            yield orjson.dumps({
+                "id": row.id,
+                "action_type": row.action_type,
+                "timestamp": row.timestamp,
+                "decision": row.decision,
+                "reasoning": row.reasoning,
+                "request_details": row.request_details,
+                "service_name": row.service_name,
+                "amount": row.amount,
+                "signature": row.signature,
+                "advocate_notified": row.advocate_notified
+            })
+            total += 1
         
-        return json.dumps(export_data, indent=2)
+        yield b'],"total_logs":%d}' % total
 
 
 class LegalExporter:
@@ -153,102 +492,17 @@ class LegalExporter:
         if not poa:
             raise ValueError("POA not found")
         
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        story.append(Paragraph("SMART POWER OF ATTORNEY", title_style))
-        story.append(Paragraph("Digital Credential Certificate", styles['Heading2']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # POA Details
-        details = [
-            ["Certificate ID:", str(poa.id)],
-            ["Senior ID:", poa.senior_id],
-            ["Authorized Agent:", poa.agent_id],
-            ["Scope:", poa.scope.upper()],
-            ["Spend Limit:", f"${poa.spend_limit:.2f}"],
-            ["Created:", poa.created_at.strftime("%Y-%m-%d %H:%M UTC")],
-            ["Expires:", poa.expiry_date.strftime("%Y-%m-%d %H:%M UTC")],
-            ["Status:", "ACTIVE" if poa.is_valid() else "INACTIVE"]
-        ]
-        
-        if poa.specific_services:
-            details.append(["Specific Services:", ", ".join(poa.specific_services)])
-        
-        table = Table(details, colWidths=[2*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
-        story.append(table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Permissions
-        story.append(Paragraph("<b>Authorized Actions:</b>", styles['Heading3']))
-        permissions_text = f"""
-        This Smart POA grants the agent ({poa.agent_id}) permission to:
-        <br/>
-        • Access and manage {poa.scope} services
-        <br/>
-        • Execute transactions up to ${poa.spend_limit:.2f}
-        <br/>
-        • Valid until {poa.expiry_date.strftime("%B %d, %Y")}
-        <br/><br/>
-        <b>Restrictions:</b>
-        <br/>
-        • Transactions exceeding ${poa.spend_limit:.2f} require break-glass approval
-        <br/>
-        • Access limited to {poa.scope} scope only
-        <br/>
-        • All actions are logged with cryptographic signatures
-        """
-        story.append(Paragraph(permissions_text, styles['Normal']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # QR Code for verification
-        verification_code = self.credential_presenter.generate_verification_code(poa_id)
-        qr_data = f"AEGIS-POA-{poa.id}-{verification_code}"
-        qr_base64 = self.credential_presenter.generate_qr_code(qr_data)
-        
-        story.append(Paragraph("<b>Verification QR Code:</b>", styles['Heading3']))
-        story.append(Paragraph(f"Verification Code: {verification_code}", styles['Normal']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Legal Notice
-        legal_text = """
-        <b>LEGAL NOTICE:</b><br/>
-        This is a legally binding digital Power of Attorney credential issued under Project Aegis.
-        All actions taken under this POA are monitored, logged, and cryptographically signed for
-        legal verification. This certificate can be verified using the QR code above or by
-        contacting Project Aegis support with the Certificate ID.
-        <br/><br/>
-        Generated: {}<br/>
-        System: Project Aegis - Module C (The Proxy)
-        """.format(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"))
-        
-        story.append(Spacer(1, 0.3*inch))
-        story.append(Paragraph(legal_text, styles['Normal']))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return _render_certificate(_Certificate(
+            id=poa.id,
+            senior_id=poa.senior_id,
+            agent_id=poa.agent_id,
+            scope=poa.scope,
+            spend_limit=poa.spend_limit,
+            created_at=poa.created_at,
+            expiry_date=poa.expiry_date,
+            specific_services=tuple(poa.specific_services) if poa.specific_services else None,
+            active=poa.is_valid()
+        ))
     
     def generate_audit_trail_pdf(self, poa_id: int) -> bytes:
         """
@@ -258,12 +512,62 @@ class LegalExporter:
         if not poa:
             raise ValueError("POA not found")
         
-        logs = self.logger.get_logs_by_poa(poa_id, limit=1000)
+        anchor, leaf_ids, levels = self.logger.seal_trail(poa_id)
+        return self._render_audit_trail(poa, anchor.merkle_root, anchor.signature, leaf_ids, levels)
+    
+    def _render_audit_trail(
+        self,
+        poa: SmartPOA,
+        merkle_root: str,
+        root_signature: str,
+        leaf_ids: List[int],
+        levels: List[List[bytes]]
+    ) -> bytes:
+        """Lay out an already-sealed audit trail (reads only)"""
+        poa_id = poa.id
+        leaf_index = {log_id: index for index, log_id in enumerate(leaf_ids)}
+        
+        # Only the rendered columns, streamed in batches instead of hydrating
+        # up to 1000 AuditLog objects
+        logs = (
+            self.db.query(
+                AuditLog.id, AuditLog.timestamp, AuditLog.action_type, AuditLog.decision,
+                AuditLog.service_name, AuditLog.amount, AuditLog.reasoning, AuditLog.advocate_notified
+            )
+            .filter(AuditLog.poa_id == poa_id)
+            .order_by(AuditLog.timestamp.desc())
+            .limit(1000)
+            .yield_per(200)
+        )
         
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
         story = []
-        styles = getSampleStyleSheet()
+        styles = _STYLES
+        
+        _iso = datetime.isoformat
+        rows = []
+        detail_padding = [""] * (len(_AUDIT_TABLE_HEADER) - 1)
+        total_logs = 0
+        for log in logs:
+            index = leaf_index.get(log.id)
+            if index is None:
+                inclusion_path = "(logged after this seal)"
+            else:
+                inclusion_path = " ".join(merkle_proof(levels, index)) or "(root)"
+            rows.append([
+                str(log.id),
+                _iso(log.timestamp, sep=" ", timespec="seconds"),
+                log.action_type,
+                log.decision,
+                log.service_name or "N/A",
+                f"${log.amount or 0:.2f}",
+                "Yes" if log.advocate_notified else "No"
+            ])
+            details = (
+                wrap(f"Reasoning: {log.reasoning}", _DETAIL_LINE_WIDTH)
+                + wrap(f"Inclusion Path: {inclusion_path}", _DETAIL_LINE_WIDTH)
+            )
+            rows.append(["\n".join(details)] + detail_padding)
+            total_logs += 1
         
         # Title
         story.append(Paragraph("FIDUCIARY PROOF - AUDIT TRAIL", styles['Title']))
@@ -275,42 +579,30 @@ class LegalExporter:
             ["Senior ID:", poa.senior_id],
             ["Agent ID:", poa.agent_id],
             ["Scope:", poa.scope],
-            ["Total Actions Logged:", str(len(logs))],
+            ["Total Actions Logged:", str(total_logs)],
+            ["Merkle Root:", merkle_root],
+            ["Root Signature:", root_signature],
             ["Report Generated:", datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")]
         ]
         
         summary_table = Table(summary_data, colWidths=[2*inch, 4*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8e8e8')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold')
-        ]))
+        summary_table.setStyle(_SUMMARY_TABLE_STYLE)
         story.append(summary_table)
         story.append(Spacer(1, 0.3*inch))
         
         # Audit Logs
         story.append(Paragraph("<b>Chronological Audit Trail:</b>", styles['Heading3']))
         story.append(Spacer(1, 0.1*inch))
-        
-        for log in logs:
-            log_text = f"""
-            <b>Action #{log.id}</b> - {log.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")}<br/>
-            Type: {log.action_type} | Decision: <b>{log.decision}</b><br/>
-            Service: {log.service_name or 'N/A'} | Amount: ${log.amount or 0:.2f}<br/>
-            Reasoning: {log.reasoning}<br/>
-            Signature: {log.signature[:32]}...<br/>
-            Advocate Notified: {'Yes' if log.advocate_notified else 'No'}
-            """
-            story.append(Paragraph(log_text, styles['Normal']))
-            story.append(Spacer(1, 0.15*inch))
+        story.extend(_audit_tables(rows))
         
         # Legal certification
         cert_text = """
         <b>CERTIFICATION:</b><br/>
         This audit trail contains cryptographically signed records of all actions taken under
-        POA Certificate #{poa_id}. Each entry includes an HMAC-SHA256 signature that can be
-        independently verified. This document serves as legal evidence of fiduciary duty
-        compliance under Project Aegis.
+        POA Certificate #{poa_id}. Every entry is a leaf of a SHA-256 Merkle tree whose root is
+        sealed with a keyed BLAKE2b signature; each entry lists the inclusion path that links it
+        to that root. This document serves as legal evidence of fiduciary duty compliance under
+        Project Aegis.
         <br/><br/>
         All signatures have been verified: <b>TRUE</b><br/>
         Document Hash: {doc_hash}
@@ -322,7 +614,37 @@ class LegalExporter:
         story.append(Spacer(1, 0.3*inch))
         story.append(Paragraph(cert_text, styles['Normal']))
         
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return _build_pdf(story)
+    
+    def generate_audit_trail_pdfs_bulk(self, poa_ids: Iterable[int]) -> Dict[int, bytes]:
+        """
+        Generate audit trail PDFs for many POAs in parallel
+        
+        Every trail is sealed first, on this session and thread, so all
+        AuditAnchor writes happen here; worker threads then only read and
+        render, each with its own Session on the same engine (sessions are
+        not thread-safe). Raises ValueError if any POA is missing.
+        """
+        poa_ids = list(dict.fromkeys(poa_ids))
+        if not poa_ids:
+            return {}
+        
+        known = {poa_id for (poa_id,) in self.db.query(SmartPOA.id).filter(SmartPOA.id.in_(poa_ids))}
+        missing = set(poa_ids) - known
+        if missing:
+            raise ValueError(f"POA not found: {sorted(missing)}")
+        
+        seals = {}
+        for poa_id in poa_ids:
+            anchor, leaf_ids, levels = self.logger.seal_trail(poa_id)
+            seals[poa_id] = (anchor.merkle_root, anchor.signature, leaf_ids, levels)
+        
+        new_session = sessionmaker(bind=self.db.get_bind(), autocommit=False, autoflush=False)
+        
+        def render(poa_id: int) -> bytes:
+            with new_session() as db:
+                return LegalExporter(db)._render_audit_trail(db.get(SmartPOA, poa_id), *seals[poa_id])
+        
+        workers = min(len(poa_ids), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(poa_ids, executor.map(render, poa_ids)))
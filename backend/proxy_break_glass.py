@@ -2,17 +2,32 @@
 Module C: The Proxy - Break-Glass Protocol
 2FA, Liveness Detection, and Push Notifications
 """
+import asyncio
 import os
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session, joinedload
 import pyotp
 import hashlib
+import hmac
+from functools import lru_cache
 
 from proxy_models import BreakGlassEvent, AuditLog, SmartPOA
 
 
+# Fallback when TOTP_SECRET is unset; one per process so a code generated in one
+# request still verifies in the next
+_PROCESS_TOTP_SECRET = pyotp.random_base32()
+
+
+@lru_cache(maxsize=8)
+def _totp(secret: str) -> pyotp.TOTP:
+    """TOTP with a 5-minute window, built once per secret (base32 decoded once)"""
+    return pyotp.TOTP(secret, interval=300)
+
+
 class TwoFactorAuth:
     """
     Generate and verify 2FA codes
@@ -21,17 +36,16 @@ class TwoFactorAuth:
     
     def __init__(self):
         # Use secret key from environment or generate
-        self.secret = os.getenv("TOTP_SECRET", pyotp.random_base32())
+        self.secret = os.getenv("TOTP_SECRET") or _PROCESS_TOTP_SECRET
+        self._totp = _totp(self.secret)
     
     def generate_code(self) -> str:
         """Generate 6-digit 2FA code"""
-        totp = pyotp.TOTP(self.secret, interval=300)  # 5-minute window
-        return totp.now()
+        return self._totp.now()
     
     def verify_code(self, code: str) -> bool:
         """Verify 2FA code (allows 5-minute window)"""
-        totp = pyotp.TOTP(self.secret, interval=300)
-        return totp.verify(code, valid_window=1)
+        return self._totp.verify(code, valid_window=1)
     
     def generate_backup_code(self) -> str:
         """Generate one-time backup code"""
@@ -106,7 +120,7 @@ class PushNotificationService:
         self.twilio_sid = os.getenv("TWILIO_ACCOUNT_SID")
         self.sendgrid_key = os.getenv("SENDGRID_API_KEY")
     
-    def send_push(
+    async def send_push(
         self,
         advocate_id: str,
         title: str,
@@ -129,7 +143,7 @@ class PushNotificationService:
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    def send_sms(self, phone_number: str, message: str) -> Dict[str, Any]:
+    async def send_sms(self, phone_number: str, message: str) -> Dict[str, Any]:
         """
         Send SMS via Twilio
         
@@ -145,7 +159,7 @@ class PushNotificationService:
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    def send_email(
+    async def send_email(
         self,
         email: str,
         subject: str,
@@ -186,7 +200,8 @@ class BreakGlassMonitor:
         trigger_reason: str,
         trigger_details: Dict[str, Any],
         advocate_id: str,
-        require_liveness: bool = False
+        require_liveness: bool = False,
+        background_tasks: Optional[BackgroundTasks] = None
     ) -> BreakGlassEvent:
         """
         Trigger break-glass protocol
@@ -196,6 +211,10 @@ class BreakGlassMonitor:
         2. Generate 2FA code
         3. Send notifications to Trusted Advocate
         4. Wait for verification
+        
+        With background_tasks, notifications go out after the response is
+        sent; the committed PENDING event is all the caller waits for. The
+        commit also covers the triggering audit log if it is still pending.
         """
         # Generate 2FA code
         two_fa_code = self.two_fa.generate_code()
@@ -217,23 +236,30 @@ class BreakGlassMonitor:
         self.db.commit()
         self.db.refresh(event)
         
+        # Audit log and its POA in one joined SELECT; the notifier needs no
+        # further database access, so it can run after the session closes
+        audit_log = self.db.get(AuditLog, audit_log_id, options=[joinedload(AuditLog.poa)])
+        if not audit_log:
+            return event
+        
         # Send notifications
-        self._send_break_glass_notifications(event, two_fa_code)
+        if background_tasks is not None:
+            background_tasks.add_task(
+                self._send_break_glass_notifications, event, two_fa_code, audit_log, audit_log.poa
+            )
+        else:
+            asyncio.run(self._send_break_glass_notifications(event, two_fa_code, audit_log, audit_log.poa))
         
         return event
     
-    def _send_break_glass_notifications(self, event: BreakGlassEvent, two_fa_code: str):
+    async def _send_break_glass_notifications(
+        self,
+        event: BreakGlassEvent,
+        two_fa_code: str,
+        audit_log: AuditLog,
+        poa: SmartPOA
+    ):
         """Send all notifications for break-glass event"""
-        # Get POA details from audit log
-        audit_log = self.db.query(AuditLog).filter(
-            AuditLog.id == event.audit_log_id
-        ).first()
-        
-        if not audit_log:
-            return
-        
-        poa = self.db.query(SmartPOA).filter(SmartPOA.id == audit_log.poa_id).first()
-        
         # Prepare message
         title = "🚨 Break-Glass Protocol Triggered"
         message = f"""
@@ -249,8 +275,8 @@ Your 2FA code: {two_fa_code}
 Please review and approve/deny this request.
         """.strip()
         
-        # Send push notification
-        self.notifications.send_push(
+        # Push notification
+        sends = [self.notifications.send_push(
             advocate_id=event.advocate_id,
             title=title,
             message=message,
@@ -259,24 +285,27 @@ Please review and approve/deny this request.
                 "poa_id": audit_log.poa_id,
                 "two_fa_code": two_fa_code
             }
-        )
+        )]
         
-        # Send SMS if configured
+        # SMS if configured
         advocate_phone = os.getenv("TRUSTED_ADVOCATE_PHONE")
         if advocate_phone:
-            self.notifications.send_sms(
+            sends.append(self.notifications.send_sms(
                 phone_number=advocate_phone,
                 message=f"{title}\n\n{message}"
-            )
+            ))
         
-        # Send email if configured
+        # Email if configured
         advocate_email = os.getenv("TRUSTED_ADVOCATE_EMAIL")
         if advocate_email:
-            self.notifications.send_email(
+            sends.append(self.notifications.send_email(
                 email=advocate_email,
                 subject=title,
                 body=message
-            )
+            ))
+        
+        # Channels go out concurrently; one failing doesn't stop the others
+        await asyncio.gather(*sends, return_exceptions=True)
     
     def verify_2fa(self, event_id: int, code: str) -> Dict[str, Any]:
         """Verify 2FA code for break-glass event"""
@@ -295,8 +324,11 @@ Please review and approve/deny this request.
             self.db.commit()
             return {"verified": False, "error": "Event expired"}
         
-        # Verify code
-        if code == event.two_fa_code or self.two_fa.verify_code(code):
+        # Verify code (constant-time against the stored one)
+        matches_stored = event.two_fa_code is not None and hmac.compare_digest(
+            code.encode(), event.two_fa_code.encode()
+        )
+        if matches_stored or self.two_fa.verify_code(code):
             event.two_fa_verified_at = datetime.utcnow()
             
             # If liveness not required, approve immediately
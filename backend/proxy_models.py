@@ -2,8 +2,11 @@
 Module C: The Proxy - Database Models
 Digital POA Vault, Token Storage, Audit Trail, and Break-Glass Events
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON, Index, LargeBinary, text
+)
+from sqlalchemy.orm import reconstructor, relationship
+from sqlalchemy.orm.attributes import instance_state
 from datetime import datetime, timedelta
 from models import Base
 
@@ -36,9 +39,33 @@ class SmartPOA(Base):
     created_by = Column(String(100), nullable=True)  # Who created this POA
     revocation_reason = Column(Text, nullable=True)
     
-    # Relationships
-    tokens = relationship("EncryptedToken", back_populates="poa", cascade="all, delete-orphan")
-    audit_logs = relationship("AuditLog", back_populates="poa", cascade="all, delete-orphan")
+    # Relationships. Nothing walks these implicitly: a lazy load raises
+    # instead of costing a SELECT per POA. Tokens can be fetched up front with
+    # selectinload; audit_logs is unbounded and always gets its own query.
+    tokens = relationship(
+        "EncryptedToken", back_populates="poa", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    audit_logs = relationship(
+        "AuditLog", back_populates="poa", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    
+    __table_args__ = (
+        # Active POAs by senior (get_poas_by_senior). Partial, so revoked and
+        # inactive history stays out; the predicate must match the query's
+        # is_(True)/is_(None) filters verbatim for SQLite to use it.
+        Index(
+            "ix_smartpoa_senior_active", "senior_id", "expiry_date",
+            postgresql_where=text("is_active IS true AND revoked_at IS NULL"),
+            sqlite_where=text("is_active IS 1 AND revoked_at IS NULL")
+        ),
+    )
+    
+    @reconstructor
+    def _init_on_load(self):
+        # specific_services as a set, built once per loaded row. Kept in the
+        # instance state's info, not __dict__, so serializers that walk vars()
+        # (jsonable_encoder) don't pick it up.
+        instance_state(self).info["services_set"] = frozenset(self.specific_services or ())
     
     def is_valid(self) -> bool:
         """Check if POA is currently valid"""
@@ -50,9 +77,14 @@ class SmartPOA(Base):
     
     def is_within_scope(self, service_name: str) -> bool:
         """Check if service is within POA scope"""
-        if not self.specific_services:
+        info = instance_state(self).info
+        services = info.get("services_set")
+        if services is None:
+            # Constructed rather than loaded (e.g. a cached snapshot)
+            services = info["services_set"] = frozenset(self.specific_services or ())
+        if not services:
             return True  # All services in scope allowed
-        return service_name in self.specific_services
+        return service_name in services
     
     def is_within_limit(self, amount: float) -> bool:
         """Check if amount is within spend limit"""
@@ -62,7 +94,7 @@ class SmartPOA(Base):
 class EncryptedToken(Base):
     """
     Encrypted OAuth tokens for delegated access
-    Uses Fernet symmetric encryption
+    Uses AES-256-GCM (Fernet for older rows)
     """
     __tablename__ = "encrypted_tokens"
     
@@ -71,14 +103,14 @@ class EncryptedToken(Base):
     
     service_name = Column(String(100), nullable=False)  # 'plaid', 'salt_edge', 'netflix', etc.
     token_type = Column(String(20), nullable=False)  # 'access', 'refresh'
-    encrypted_token = Column(Text, nullable=False)  # Fernet encrypted
+    encrypted_token = Column(LargeBinary, nullable=False)  # Format byte + nonce + AES-GCM ciphertext (or raw Fernet token)
     
     expires_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_used = Column(DateTime, nullable=True)
     
-    # Relationships
-    poa = relationship("SmartPOA", back_populates="tokens")
+    # Relationships (served from the identity map, never a lazy SELECT)
+    poa = relationship("SmartPOA", back_populates="tokens", lazy="raise_on_sql")
 
 
 class AuditLog(Base):
@@ -87,6 +119,13 @@ class AuditLog(Base):
     Legal-grade evidence for authorities
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # get_logs_by_poa / exports: seek by POA, read newest first without a sort
+        Index("ix_audit_poa_ts", "poa_id", text("timestamp DESC")),
+        # One successor per chain entry: a concurrent writer can't fork the chain
+        # (unchained legacy rows have NULL prev_hash and don't collide)
+        Index("uq_audit_poa_prev_hash", "poa_id", "prev_hash", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     poa_id = Column(Integer, ForeignKey("smart_poas.id"), nullable=False)
@@ -105,17 +144,23 @@ class AuditLog(Base):
     reasoning = Column(Text, nullable=False)
     
     # Cryptographic Proof
-    signature = Column(String(256), nullable=False)  # HMAC-SHA256 signature
+    signature = Column(String(256), nullable=False)  # "b2$" + keyed BLAKE2b hex (bare hex: legacy HMAC-SHA256)
     signature_verified = Column(Boolean, default=False)
     
+    # Per-POA hash chain: curr_hash = SHA-256(prev_hash || signed message)
+    prev_hash = Column(String(64), nullable=True)
+    curr_hash = Column(String(64), nullable=True)
+    
     # Advocate Notification
     advocate_notified = Column(Boolean, default=False)
     advocate_notification_time = Column(DateTime, nullable=True)
     override_code = Column(String(10), nullable=True)  # 2FA code if break-glass
     
-    # Relationships
-    poa = relationship("SmartPOA", back_populates="audit_logs")
-    break_glass_event = relationship("BreakGlassEvent", back_populates="audit_log", uselist=False)
+    # Relationships (served from the identity map or joinedload, never a lazy SELECT)
+    poa = relationship("SmartPOA", back_populates="audit_logs", lazy="raise_on_sql")
+    break_glass_event = relationship(
+        "BreakGlassEvent", back_populates="audit_log", uselist=False, lazy="raise_on_sql"
+    )
 
 
 class BreakGlassEvent(Base):
@@ -124,6 +169,10 @@ class BreakGlassEvent(Base):
     Triggered when limits are exceeded or scope is violated
     """
     __tablename__ = "break_glass_events"
+    __table_args__ = (
+        # get_pending_events filters on status, optionally narrowed to one advocate
+        Index("ix_bg_status_advocate", "status", "advocate_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     audit_log_id = Column(Integer, ForeignKey("audit_logs.id"), nullable=False, unique=True)
@@ -161,7 +210,7 @@ class BreakGlassEvent(Base):
     expires_at = Column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=1))
     
     # Relationships
-    audit_log = relationship("AuditLog", back_populates="break_glass_event")
+    audit_log = relationship("AuditLog", back_populates="break_glass_event", lazy="raise_on_sql")
     
     def is_expired(self) -> bool:
         """Check if break-glass event has expired"""
@@ -176,6 +225,24 @@ class BreakGlassEvent(Base):
         )
 
 
+class AuditAnchor(Base):
+    """
+    Sealed Merkle root over a POA's audit trail
+    One signature vouches for every log it covers
+    """
+    __tablename__ = "audit_anchors"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    poa_id = Column(Integer, ForeignKey("smart_poas.id"), nullable=False, index=True)
+    
+    merkle_root = Column(String(64), nullable=False)  # SHA-256 hex
+    leaf_count = Column(Integer, nullable=False)
+    last_log_id = Column(Integer, nullable=True)  # Newest audit log covered
+    signature = Column(String(256), nullable=False)  # Keyed BLAKE2b over the root
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class CredentialPresentation(Base):
     """
     Track when and where POA credentials were presented
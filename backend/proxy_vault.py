@@ -3,23 +3,189 @@ Module C: The Proxy - Digital POA Vault
 Encryption, Token Management, and Credential Presentation
 """
 import os
+import sqlite3
 import hashlib
 import hmac
-import json
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from cryptography.fernet import Fernet
-from sqlalchemy.orm import Session
-import qrcode
+from fastapi import BackgroundTasks
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+import segno
 from io import BytesIO
 import base64
+import orjson
+from functools import lru_cache
 
+from db import engine
 from proxy_models import SmartPOA, EncryptedToken, AuditLog, CredentialPresentation
 
 
+# Signatures are keyed BLAKE2b-256, tagged with this prefix; untagged ones
+# are the HMAC-SHA256 signatures of older rows and still verify
+BLAKE2_PREFIX = "b2$"
+
+
+@lru_cache(maxsize=8)
+def _blake2_template(secret_key: str, digest_size: int = 32):
+    """Keyed BLAKE2b state; copy() it per message instead of re-keying"""
+    key = secret_key.encode()
+    if len(key) > hashlib.blake2b.MAX_KEY_SIZE:
+        key = hashlib.blake2b(key).digest()
+    return hashlib.blake2b(key=key, digest_size=digest_size)
+
+
+@lru_cache(maxsize=8)
+def _hmac_template(secret_key: str) -> hmac.HMAC:
+    """Keyed HMAC-SHA256 state for legacy signatures"""
+    return hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+
+
+def _sign(secret_key: str, message: bytes) -> str:
+    digest = _blake2_template(secret_key).copy()
+    digest.update(message)
+    return BLAKE2_PREFIX + digest.hexdigest()
+
+
+def _legacy_sign(secret_key: str, message: bytes) -> str:
+    mac = _hmac_template(secret_key).copy()
+    mac.update(message)
+    return mac.hexdigest()
+
+
+# Signatures already checked, keyed on everything the check depends on
+VERIFY_CACHE_SIZE = 10_000
+
+
+@lru_cache(maxsize=VERIFY_CACHE_SIZE)
+def _verify_cached(secret_key: str, message: bytes, signature: str) -> bool:
+    """
+    Signature check, memoised per (key, message, signature)
+    
+    The key covers the signed bytes themselves rather than a row id, so an
+    edited row misses the cache and is checked afresh.
+    """
+    if signature.startswith(BLAKE2_PREFIX):
+        expected = _sign(secret_key, message)
+    else:
+        expected = _legacy_sign(secret_key, message)
+    return hmac.compare_digest(expected, signature)
+
+
+def canonical_bytes(data: Dict[str, Any]) -> bytes:
+    """Canonical signed form of a payload: compact JSON with sorted keys"""
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+
+def audit_message(
+    poa_id: int,
+    action_type: str,
+    timestamp: datetime,
+    decision: str,
+    request_details: Dict[str, Any]
+) -> bytes:
+    """Bytes an audit log signature covers (timestamp is the row's own timestamp)"""
+    return canonical_bytes({
+        "poa_id": poa_id,
+        "action_type": action_type,
+        "timestamp": timestamp.isoformat(),
+        "decision": decision,
+        "request_details": request_details
+    })
+
+
+# Stored token layout: format byte, 96-bit nonce, AES-256-GCM ciphertext + tag.
+# Tokens starting with Fernet's 0x80 version byte predate it and still decrypt.
+TOKEN_FORMAT_AESGCM = b"\x01"
+_FERNET_VERSION = 0x80
+_NONCE_SIZE = 12
+
+
+# prev_hash of the first entry in a POA's audit chain
+GENESIS_HASH = "0" * 64
+
+
+def chain_hash(prev_hash: str, message: bytes) -> str:
+    """Next link of an audit hash chain"""
+    digest = hashlib.sha256(prev_hash.encode())
+    digest.update(message)
+    return digest.hexdigest()
+
+
+_CHAIN_HEAD = (
+    select(AuditLog.curr_hash)
+    .where(AuditLog.poa_id == bindparam("poa_id"), AuditLog.curr_hash.isnot(None))
+    .order_by(AuditLog.id.desc())
+    .limit(1)
+)
+_INSERT_AUDIT_LOGS = insert(AuditLog).returning(AuditLog.id, sort_by_parameter_order=True)
+
+# Attempts at linking a batch when a concurrent writer took a head first
+AUDIT_CHAIN_RETRIES = 3
+
+
+def audit_chain_head(db: Union[Session, Connection], poa_id: int) -> str:
+    """curr_hash of the newest chained audit log for a POA"""
+    return db.execute(_CHAIN_HEAD, {"poa_id": poa_id}).scalar() or GENESIS_HASH
+
+
+def _lock_audit_chains(db: Union[Session, Connection], poa_ids) -> None:
+    """Take the write lock that orders chained inserts, before any head is read"""
+    conn = db.connection() if isinstance(db, Session) else db
+    if conn.dialect.name == "sqlite":
+        # pysqlite only opens its transaction at the first INSERT, after the
+        # head was read. BEGIN IMMEDIATE takes the database write lock up
+        # front; an already-open transaction has written, so it holds it.
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        # Row locks on the POAs, in id order so concurrent batches can't deadlock
+        conn.execute(
+            select(SmartPOA.id).where(SmartPOA.id.in_(sorted(poa_ids))).order_by(SmartPOA.id).with_for_update()
+        )
+
+
+def append_audit_logs(
+    db: Union[Session, Connection],
+    rows: List[Tuple[Dict[str, Any], bytes]]
+) -> List[int]:
+    """
+    Link signed audit logs into their POAs' hash chains and INSERT them
+    
+    Every audit writer goes through here. rows are (column values without
+    prev_hash/curr_hash, signed message) pairs; the new ids come back in row
+    order. The chain lock is held until the caller commits. (poa_id,
+    prev_hash) is unique, so a writer that got past the lock still can't
+    fork a chain: its insert fails and the batch is relinked.
+    """
+    if not rows:
+        # executemany with no parameter sets would emit one default-values INSERT
+        return []
+    _lock_audit_chains(db, {values["poa_id"] for values, _ in rows})
+    for attempt in range(AUDIT_CHAIN_RETRIES):
+        # Later rows for the same POA link to the row before them
+        heads: Dict[int, str] = {}
+        chained = []
+        for values, message in rows:
+            poa_id = values["poa_id"]
+            prev_hash = heads.get(poa_id) or audit_chain_head(db, poa_id)
+            heads[poa_id] = curr_hash = chain_hash(prev_hash, message)
+            chained.append({**values, "prev_hash": prev_hash, "curr_hash": curr_hash})
+        try:
+            with db.begin_nested():
+                return db.execute(_INSERT_AUDIT_LOGS, chained).scalars().all()
+        except IntegrityError:
+            if attempt == AUDIT_CHAIN_RETRIES - 1:
+                raise
+
+
 class VaultEncryption:
     """
-    Fernet symmetric encryption for OAuth tokens
+    AES-256-GCM encryption for OAuth tokens (Fernet for older rows)
     Uses environment variable for encryption key
     """
     
@@ -34,30 +200,77 @@ class VaultEncryption:
             key = key.encode() if isinstance(key, str) else key
         
         self.cipher = Fernet(key)
+        # One AEAD object (and key schedule) for every token; its key is derived
+        # from the Fernet key so VAULT_ENCRYPTION_KEY stays the only key to manage
+        self.aead = AESGCM(
+            hashlib.blake2b(b"aegis-token-aesgcm", key=base64.urlsafe_b64decode(key), digest_size=32).digest()
+        )
         self.secret_key = os.getenv("SECRET_KEY", "aegis-secret-key-change-in-production")
     
-    def encrypt_token(self, token: str) -> str:
-        """Encrypt OAuth token using Fernet"""
-        return self.cipher.encrypt(token.encode()).decode()
+    def encrypt_token(self, token: str) -> bytes:
+        """Encrypt OAuth token using AES-256-GCM"""
+        nonce = os.urandom(_NONCE_SIZE)
+        return TOKEN_FORMAT_AESGCM + nonce + self.aead.encrypt(nonce, token.encode(), TOKEN_FORMAT_AESGCM)
     
-    def decrypt_token(self, encrypted_token: str) -> str:
+    def decrypt_token(self, encrypted_token: bytes) -> str:
         """Decrypt OAuth token"""
-        return self.cipher.decrypt(encrypted_token.encode()).decode()
+        if encrypted_token[0] == _FERNET_VERSION:
+            return self.cipher.decrypt(base64.urlsafe_b64encode(encrypted_token)).decode()
+        nonce = encrypted_token[1:1 + _NONCE_SIZE]
+        return self.aead.decrypt(nonce, encrypted_token[1 + _NONCE_SIZE:], encrypted_token[:1]).decode()
     
     def sign_data(self, data: Dict[str, Any]) -> str:
-        """Create HMAC-SHA256 signature for audit logs"""
-        message = json.dumps(data, sort_keys=True).encode()
-        signature = hmac.new(
-            self.secret_key.encode(),
-            message,
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        """Create keyed BLAKE2b signature for audit logs"""
+        return self.sign_bytes(canonical_bytes(data))
+    
+    def sign_bytes(self, message: bytes) -> str:
+        """Keyed BLAKE2b signature over an already-serialized message"""
+        return _sign(self.secret_key, message)
     
     def verify_signature(self, data: Dict[str, Any], signature: str) -> bool:
-        """Verify HMAC signature"""
-        expected_signature = self.sign_data(data)
-        return hmac.compare_digest(expected_signature, signature)
+        """Verify signature"""
+        return self.verify_bytes(canonical_bytes(data), signature)
+    
+    def verify_bytes(self, message: bytes, signature: str) -> bool:
+        """Verify a signature (BLAKE2b or legacy HMAC) over an already-serialized message"""
+        return _verify_cached(self.secret_key, message, signature)
+
+
+@lru_cache(maxsize=1)
+def get_vault_encryption() -> VaultEncryption:
+    """
+    Process-wide VaultEncryption
+    
+    Keys are read and the Fernet cipher built once, and a development key
+    generated when VAULT_ENCRYPTION_KEY is unset stays the same for every
+    manager, so tokens encrypted by one request decrypt in the next.
+    """
+    return VaultEncryption()
+
+
+# POA children never lazy-load (see proxy_models); tokens can be fetched up
+# front (one SELECT ... IN) when wanted
+_POA_WITH_TOKENS = (selectinload(SmartPOA.tokens),)
+
+# Writes use INSERT ... RETURNING, available from SQLite 3.35: one round-trip
+# per row instead of INSERT + commit + a refresh SELECT. RuntimeError, not
+# ImportError: main.py would silently drop the Proxy routes on an ImportError.
+if engine.dialect.name == "sqlite" and sqlite3.sqlite_version_info < (3, 35, 0):
+    raise RuntimeError(f"Proxy requires SQLite 3.35+ for INSERT ... RETURNING (found {sqlite3.sqlite_version})")
+
+_INSERT_TOKENS = insert(EncryptedToken).returning(EncryptedToken.id, sort_by_parameter_order=True)
+
+
+def _insert_returning(db: Session, model, values: Dict[str, Any]):
+    """
+    INSERT one ORM row and get it back fully loaded from RETURNING
+
+    The object is detached before the caller commits, so the commit doesn't
+    expire it and reading its columns afterwards needs no extra SELECT.
+    """
+    row = db.scalars(insert(model).returning(model), [values]).one()
+    db.expunge(row)
+    return row
 
 
 class SmartPOAManager:
@@ -65,9 +278,13 @@ class SmartPOAManager:
     Manage Smart Power of Attorney creation, validation, and revocation
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, audit_batcher=None, poa_cache=None):
         self.db = db
-        self.encryption = VaultEncryption()
+        self.encryption = get_vault_encryption()
+        # Optional AuditLogBatcher; without one each audit log commits on its own
+        self.audit_batcher = audit_batcher
+        # Optional POAStateCache, kept in step with revocations
+        self.poa_cache = poa_cache
     
     def create_poa(
         self,
@@ -91,20 +308,17 @@ class SmartPOAManager:
             specific_services: Optional list of specific services (e.g., ['AT&T', 'Water Bill'])
             created_by: Who created this POA
         """
-        poa = SmartPOA(
-            senior_id=senior_id,
-            agent_id=agent_id,
-            scope=scope,
-            spend_limit=spend_limit,
-            expiry_date=datetime.utcnow() + timedelta(days=expiry_days),
-            specific_services=specific_services,
-            created_by=created_by,
-            is_active=True
-        )
-        
-        self.db.add(poa)
+        poa = _insert_returning(self.db, SmartPOA, {
+            "senior_id": senior_id,
+            "agent_id": agent_id,
+            "scope": scope,
+            "spend_limit": spend_limit,
+            "expiry_date": datetime.utcnow() + timedelta(days=expiry_days),
+            "specific_services": specific_services,
+            "created_by": created_by,
+            "is_active": True
+        })
         self.db.commit()
-        self.db.refresh(poa)
         
         # Create audit log
         self._create_audit_log(
@@ -123,17 +337,27 @@ class SmartPOAManager:
         
         return poa
     
-    def get_poa(self, poa_id: int) -> Optional[SmartPOA]:
-        """Retrieve POA by ID"""
-        return self.db.query(SmartPOA).filter(SmartPOA.id == poa_id).first()
+    def get_poa(self, poa_id: int, load_children: bool = False) -> Optional[SmartPOA]:
+        """Retrieve POA by ID (load_children also fetches its tokens)"""
+        if not load_children:
+            # Served from the session's identity map when this request already
+            # loaded the POA; only a miss costs a SELECT
+            return self.db.get(SmartPOA, poa_id)
+        return self.db.query(SmartPOA).options(*_POA_WITH_TOKENS).filter(SmartPOA.id == poa_id).first()
     
-    def get_poas_by_senior(self, senior_id: str, active_only: bool = True) -> List[SmartPOA]:
-        """Get all POAs for a senior"""
-        query = self.db.query(SmartPOA).filter(SmartPOA.senior_id == senior_id)
+    def get_poas_by_senior(
+        self,
+        senior_id: str,
+        active_only: bool = True,
+        load_children: bool = False
+    ) -> List[SmartPOA]:
+        """Get all POAs for a senior (load_children also fetches their tokens)"""
+        options = _POA_WITH_TOKENS if load_children else ()
+        query = self.db.query(SmartPOA).options(*options).filter(SmartPOA.senior_id == senior_id)
         if active_only:
             query = query.filter(
-                SmartPOA.is_active == True,
-                SmartPOA.revoked_at == None,
+                SmartPOA.is_active.is_(True),
+                SmartPOA.revoked_at.is_(None),
                 SmartPOA.expiry_date > datetime.utcnow()
             )
         return query.all()
@@ -149,6 +373,8 @@ class SmartPOAManager:
         poa.revocation_reason = reason
         
         self.db.commit()
+        if self.poa_cache is not None:
+            self.poa_cache.invalidate(poa_id)
         
         # Create audit log
         self._create_audit_log(
@@ -179,20 +405,46 @@ class SmartPOAManager:
         if expires_in_seconds:
             expires_at = datetime.utcnow() + timedelta(seconds=expires_in_seconds)
         
-        token_record = EncryptedToken(
-            poa_id=poa_id,
-            service_name=service_name,
-            token_type=token_type,
-            encrypted_token=encrypted,
-            expires_at=expires_at
-        )
-        
-        self.db.add(token_record)
+        token_record = _insert_returning(self.db, EncryptedToken, {
+            "poa_id": poa_id,
+            "service_name": service_name,
+            "token_type": token_type,
+            "encrypted_token": encrypted,
+            "expires_at": expires_at
+        })
         self.db.commit()
-        self.db.refresh(token_record)
         
         return token_record
     
+    def store_oauth_tokens(self, poa_id: int, tokens: List[Dict[str, Any]]) -> List[int]:
+        """
+        Store many encrypted OAuth tokens for one POA in a single transaction
+        
+        Each entry takes the same keys as store_oauth_token's arguments (except
+        poa_id). Returns the new token ids in entry order.
+        """
+        if not tokens:
+            return []
+        now = datetime.utcnow()
+        rows = [
+            {
+                "poa_id": poa_id,
+                "service_name": entry["service_name"],
+                "token_type": entry.get("token_type", "access"),
+                "encrypted_token": self.encryption.encrypt_token(entry["token"]),
+                "expires_at": (
+                    now + timedelta(seconds=entry["expires_in_seconds"])
+                    if entry.get("expires_in_seconds") else None
+                ),
+                "created_at": now
+            }
+            for entry in tokens
+        ]
+        
+        token_ids = self.db.execute(_INSERT_TOKENS, rows).scalars().all()
+        self.db.commit()
+        return token_ids
+    
     def get_decrypted_token(self, token_id: int) -> Optional[str]:
         """Retrieve and decrypt OAuth token"""
         token_record = self.db.query(EncryptedToken).filter(
@@ -220,36 +472,59 @@ class SmartPOAManager:
         reasoning: str,
         request_details: Dict[str, Any],
         service_name: Optional[str] = None,
-        amount: Optional[float] = None
-    ) -> AuditLog:
-        """Create signed audit log entry"""
-        # Create signature
-        signature_data = {
+        amount: Optional[float] = None,
+        commit: bool = True,
+        timestamp: Optional[datetime] = None
+    ) -> int:
+        """
+        Create signed audit log entry and return its id
+        
+        With commit=False the row is only inserted, to be committed with the
+        caller's next write (ignored when batching, which commits itself).
+        timestamp defaults to now; deferred logs pass the decision time.
+        """
+        # The signed timestamp is stored on the row so verification can rebuild
+        # the exact same canonical bytes
+        timestamp = timestamp or datetime.utcnow()
+        message = audit_message(poa_id, action_type, timestamp, decision, request_details)
+        values = {
             "poa_id": poa_id,
             "action_type": action_type,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "decision": decision,
-            "request_details": request_details
+            "reasoning": reasoning,
+            "request_details": request_details,
+            "service_name": service_name,
+            "amount": amount,
+            "signature": self.encryption.sign_bytes(message),
+            "signature_verified": True
         }
-        signature = self.encryption.sign_data(signature_data)
-        
-        audit_log = AuditLog(
-            poa_id=poa_id,
-            action_type=action_type,
-            decision=decision,
-            reasoning=reasoning,
-            request_details=request_details,
-            service_name=service_name,
-            amount=amount,
-            signature=signature,
-            signature_verified=True
-        )
         
-        self.db.add(audit_log)
-        self.db.commit()
-        self.db.refresh(audit_log)
+        if self.audit_batcher is not None:
+            # Committed together with concurrent requests' logs; chained there
+            return self.audit_batcher.submit(values, message)
+        
+        audit_log_id = append_audit_logs(self.db, [(values, message)])[0]
+        if commit:
+            self.db.commit()
+        
+        return audit_log_id
+    
+    def _create_audit_log_later(self, background_tasks: BackgroundTasks, **log_args):
+        """
+        Write an audit log after the response has been sent
+        
+        The request's session is closed by then, so the log gets its own
+        session on the same engine. Its timestamp is the time of this call.
+        """
+        bind = self.db.get_bind()
+        timestamp = datetime.utcnow()
+        
+        def write():
+            with Session(bind) as db:
+                SmartPOAManager(db, self.audit_batcher)._create_audit_log(**log_args, timestamp=timestamp)
         
-        return audit_log
+        background_tasks.add_task(write)
 
 
 class TokenGatekeeper:
@@ -258,20 +533,40 @@ class TokenGatekeeper:
     Block unauthorized access
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, audit_batcher=None, poa_cache=None):
         self.db = db
-        self.poa_manager = SmartPOAManager(db)
+        self.poa_manager = SmartPOAManager(db, audit_batcher, poa_cache)
+        self.poa_cache = poa_cache
+    
+    def _load_poa(self, poa_id: int) -> Optional[SmartPOA]:
+        """POA for a decision: cached snapshot if there is one, else the database"""
+        if self.poa_cache is None:
+            return self.poa_manager.get_poa(poa_id)
+        
+        poa = self.poa_cache.get(poa_id)
+        if poa is None:
+            poa = self.poa_manager.get_poa(poa_id)
+            if poa is not None:
+                self.poa_cache.put(poa)
+        return poa
     
     def validate_request(
         self,
         poa_id: int,
         service_name: str,
         amount: Optional[float] = None,
-        action: str = "access"
+        action: str = "access",
+        background_tasks: Optional[BackgroundTasks] = None
     ) -> Dict[str, Any]:
         """
         Validate if request is authorized by POA
         
+        Each decision writes one audit log in one commit. A BREAK_GLASS
+        decision's log is left inserted but uncommitted, so it commits together
+        with the break-glass event the caller creates for it. With
+        background_tasks, an ALLOWED decision's log is written after the
+        response; BLOCKED and BREAK_GLASS logs are always written before it.
+        
         Returns:
             {
                 "authorized": bool,
@@ -280,7 +575,7 @@ class TokenGatekeeper:
                 "poa": SmartPOA or None
             }
         """
-        poa = self.poa_manager.get_poa(poa_id)
+        poa = self._load_poa(poa_id)
         
         if not poa:
             return {
@@ -327,7 +622,7 @@ class TokenGatekeeper:
         if amount is not None:
             if not poa.is_within_limit(amount):
                 # Trigger break-glass protocol
-                audit_log = self.poa_manager._create_audit_log(
+                audit_log_id = self.poa_manager._create_audit_log(
                     poa_id=poa.id,
                     action_type="SPEND_LIMIT_EXCEEDED",
                     decision="BREAK_GLASS",
@@ -339,7 +634,8 @@ class TokenGatekeeper:
                         "action": action
                     },
                     service_name=service_name,
-                    amount=amount
+                    amount=amount,
+                    commit=False
                 )
                 
                 return {
@@ -348,23 +644,27 @@ class TokenGatekeeper:
                     "reasoning": f"Amount ${amount} exceeds POA limit ${poa.spend_limit}. Break-glass protocol triggered.",
                     "poa": poa,
                     "violation_type": "SPEND_LIMIT",
-                    "audit_log_id": audit_log.id
+                    "audit_log_id": audit_log_id
                 }
         
         # Request is authorized
-        self.poa_manager._create_audit_log(
-            poa_id=poa.id,
-            action_type=f"REQUEST_{action.upper()}",
-            decision="ALLOWED",
-            reasoning=f"Request authorized for {service_name}",
-            request_details={
+        log_args = {
+            "poa_id": poa.id,
+            "action_type": f"REQUEST_{action.upper()}",
+            "decision": "ALLOWED",
+            "reasoning": f"Request authorized for {service_name}",
+            "request_details": {
                 "service_name": service_name,
                 "amount": amount,
                 "action": action
             },
-            service_name=service_name,
-            amount=amount
-        )
+            "service_name": service_name,
+            "amount": amount
+        }
+        if background_tasks is not None:
+            self.poa_manager._create_audit_log_later(background_tasks, **log_args)
+        else:
+            self.poa_manager._create_audit_log(**log_args)
         
         return {
             "authorized": True,
@@ -374,6 +674,24 @@ class TokenGatekeeper:
         }
 
 
+QR_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def _qr_code_base64(data: str) -> str:
+    """
+    Base64 PNG of a QR code for data
+
+    Rasterizing costs tens of milliseconds; re-presenting the same credential
+    is a cache hit.
+    """
+    buffer = BytesIO()
+    # segno writes the PNG itself, no PIL image in between
+    segno.make(data, error="m").save(buffer, kind="png", scale=10, border=5)
+    
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
 class CredentialPresenter:
     """
     Generate and present POA credentials
@@ -382,28 +700,19 @@ class CredentialPresenter:
     
     def __init__(self, db: Session):
         self.db = db
-        self.encryption = VaultEncryption()
+        self.encryption = get_vault_encryption()
     
     def generate_qr_code(self, data: str) -> str:
         """Generate QR code as base64 image"""
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        
-        return base64.b64encode(buffer.getvalue()).decode()
+        return _qr_code_base64(data)
     
     def generate_verification_code(self, poa_id: int) -> str:
         """Generate verification code for POA"""
-        data = {
-            "poa_id": poa_id,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        return self.encryption.sign_data(data)[:16]  # First 16 chars of signature
+        # 8-byte keyed BLAKE2b (16 hex chars) straight over "poa_id:timestamp",
+        # no JSON and no full-length signature to truncate
+        digest = _blake2_template(self.encryption.secret_key, 8).copy()
+        digest.update(f"{poa_id}:{datetime.utcnow().isoformat()}".encode())
+        return digest.hexdigest()
     
     def record_presentation(
         self,
@@ -414,15 +723,12 @@ class CredentialPresenter:
         """Record when credentials were presented"""
         verification_code = self.generate_verification_code(poa_id)
         
-        presentation = CredentialPresentation(
-            poa_id=poa_id,
-            presented_to=presented_to,
-            presentation_method=presentation_method,
-            verification_code=verification_code
-        )
-        
-        self.db.add(presentation)
+        presentation = _insert_returning(self.db, CredentialPresentation, {
+            "poa_id": poa_id,
+            "presented_to": presented_to,
+            "presentation_method": presentation_method,
+            "verification_code": verification_code
+        })
         self.db.commit()
-        self.db.refresh(presentation)
         
         return presentation
@@ -0,0 +1,58 @@
+"""
+Request bodies for the Advocate and Sentinel routers
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import Any, List, Dict, Optional
+from datetime import datetime
+
+# Advocate / Sentinel request models are defined once at module scope;
+# requests are read-only, so they are frozen.
+class RequestModel(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+class LineItemIn(RequestModel):
+    code: str
+    description: str
+    quantity: int
+    unit_price: float
+    total: float
+    date_of_service: Optional[datetime] = None
+
+class TransactionIn(RequestModel):
+    date: datetime
+    merchant: str
+    amount: float
+    category: str
+    description: str
+
+class BillAnalysisRequest(RequestModel):
+    line_items: List[LineItemIn]
+    is_in_network: bool = True
+    previous_bills: Optional[List[List[LineItemIn]]] = None
+
+class SubscriptionAuditRequest(RequestModel):
+    transactions: List[TransactionIn]
+    usage_data: Optional[Dict[str, int]] = None
+
+class NegotiationScriptRequest(RequestModel):
+    script_type: str
+    merchant: str
+    errors: Optional[List[Dict]] = None
+    total_disputed: Optional[float] = None
+    policy_holder_name: Optional[str] = None
+    subscription_amount: Optional[float] = None
+    months_unused: Optional[int] = None
+    reason: Optional[str] = None
+
+class VoiceInterceptRequest(RequestModel):
+    transcript: str
+    user_id: str = "senior_001"
+    call_metadata: Optional[Dict[str, Any]] = None
+
+class TransactionMonitorRequest(RequestModel):
+    amount: float
+    transaction_time: datetime  # parsed by pydantic-core, "Z" suffix included
+    category: str
+    merchant: str
+    user_id: str = "senior_001"
+    transaction_metadata: Optional[Dict[str, Any]] = None
@@ -0,0 +1,126 @@
+"""
+Batched SecurityLog writer for the Sentinel hot path
+Coalesces concurrent inserts into one multi-row INSERT per transaction
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from models import SecurityLog
+
+
+class SecurityLogBatcher:
+    """
+    Queue SecurityLog rows and write them in batches.
+
+    A background task drains the queue whenever it holds max_batch rows or
+    max_delay seconds after the first queued row, inserting the whole batch
+    in a single transaction (one fsync instead of one per row). Callers
+    await the row's primary key. The queue holds at most max_queue rows;
+    beyond that submit() waits for room.
+    """
+
+    def __init__(self, engine, max_batch: int = 64, max_delay: float = 0.005, max_queue: int = 1024):
+        """
+        Args:
+            engine: Async SQLAlchemy engine the logs are written to
+            max_batch: Flush once this many rows are queued
+            max_delay: Longest a queued row waits for companions (seconds)
+            max_queue: Most rows waiting to be written before submit() blocks
+        """
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self):
+        """Start the flusher task on the running event loop"""
+        if self._closed:
+            raise RuntimeError("SecurityLogBatcher is stopped")
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Flush the rows queued so far, then stop the flusher task
+
+        Rows that arrive after this point fail with RuntimeError instead of
+        waiting for a flush that never comes.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._fail_unflushed()
+
+    async def submit(self, values: Dict) -> int:
+        """Queue one SecurityLog row and wait for its id"""
+        if self._closed:
+            raise RuntimeError("SecurityLogBatcher is stopped")
+        if self._task is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((values, future))
+        if self._task.done():
+            # Stopped while this row waited for room; nothing will flush it
+            self._fail_unflushed()
+        return await future
+
+    def _fail_unflushed(self):
+        """Fail the rows left behind the stop marker (flusher has exited)"""
+        error = RuntimeError("SecurityLogBatcher is stopped")
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None and not item[1].done():
+                item[1].set_exception(error)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch: List[Tuple[Dict, asyncio.Future]] = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        try:
+            async with self.engine.begin() as conn:
+                result = await conn.execute(
+                    insert(SecurityLog).returning(SecurityLog.id, sort_by_parameter_order=True),
+                    [values for values, _ in batch]
+                )
+                ids = result.scalars().all()
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), log_id in zip(batch, ids):
+            if not future.done():
+                future.set_result(log_id)
@@ -1,14 +1,36 @@
 import os
+import re
 import json
-from openai import OpenAI
+import asyncio
+from typing import List
+from openai import AsyncOpenAI
 
 # Initialize client only if key exists, otherwise we'll mock it or error
 try:
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 except:
     client = None
 
-def analyze_call_transcript(transcript: str):
+# Most OpenAI requests in flight at once (batch analysis fans out up to this)
+OPENAI_CONCURRENCY = 20
+_openai_slots = asyncio.Semaphore(OPENAI_CONCURRENCY)
+
+# Payment demands no legitimate caller makes; these are classified locally
+# without spending an API call
+_SCAM_PAYMENT_RE = re.compile(r"gift\s*cards?|western\s*union|moneygram|wire\s*transfer", re.IGNORECASE)
+
+# Keyword screens for the mock/offline checks: one case-insensitive pass each
+# instead of lower()-copying the text and scanning once per keyword.
+# Spoken keywords must start a word, so "irs" no longer matches "first".
+_MOCK_SCAM_RE = re.compile(r"\b(?:gift\s*card|irs)", re.IGNORECASE)
+_VOICE_SCAM_RE = re.compile(
+    r"\b(?:irs|gift\s*card|urgent\s+payment|password|social\s+security|jail)", re.IGNORECASE
+)
+# Filenames match anywhere ("prize_winner.pdf")
+_SCAM_DOCUMENT_RE = re.compile(r"scam|prize|winner", re.IGNORECASE)
+_BILL_DOCUMENT_RE = re.compile(r"bill|invoice", re.IGNORECASE)
+
+async def analyze_call_transcript(transcript: str):
     """
     Analyzes a call transcript to determine if it's safe or a scam.
     Returns a dict with status and reasoning.
@@ -16,7 +38,7 @@ def analyze_call_transcript(transcript: str):
     if not client:
         # Mock response for demo purposes if no API key
         print("Warning: No OpenAI API Key found. Using mock response.")
-        if "gift card" in transcript.lower() or "irs" in transcript.lower():
+        if _MOCK_SCAM_RE.search(transcript):
             return {
                 "classification": "Confirmed Scam",
                 "reasoning": "The caller demands payment via gift cards/IRS, which is a common scam pattern."
@@ -25,6 +47,12 @@ def analyze_call_transcript(transcript: str):
             "classification": "Safe",
             "reasoning": "No suspicious keywords detected in the conversation."
         }
+    
+    if _SCAM_PAYMENT_RE.search(transcript):
+        return {
+            "classification": "Confirmed Scam",
+            "reasoning": "The caller demands payment via gift cards or a money transfer service, which is a common scam pattern."
+        }
         
     system_prompt = """
     You are 'Sentinel', an AI protector for seniors. Analyze the phone call transcript.
@@ -33,30 +61,36 @@ def analyze_call_transcript(transcript: str):
     Return JSON format: {"classification": "...", "reasoning": "..."}
     """
     
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": transcript}
-        ],
-        response_format={"type": "json_object"}
-    )
+    async with _openai_slots:
+        response = await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": transcript}
+            ],
+            response_format={"type": "json_object"}
+        )
     
     content = response.choices[0].message.content
     return json.loads(content)
 
+async def analyze_call_transcripts(transcripts: List[str]):
+    """
+    Analyzes many call transcripts concurrently.
+    Returns one result dict per transcript, in order.
+    """
+    return await asyncio.gather(*(analyze_call_transcript(t) for t in transcripts))
+
 def analyze_document_mock(filename: str):
     """
     Mock analysis for uploaded documents.
     """
-    lower_name = filename.lower()
-    
-    if "scam" in lower_name or "prize" in lower_name or "winner" in lower_name:
+    if _SCAM_DOCUMENT_RE.search(filename):
         return {
             "classification": "Confirmed Scam",
             "reasoning": "Document contains high-risk keywords ('Prize', 'Winner'). Typical mail fraud pattern."
         }
-    elif "bill" in lower_name or "invoice" in lower_name:
+    elif _BILL_DOCUMENT_RE.search(filename):
         # Simulate a high bill check
         return {
             "classification": "Safe",
@@ -72,15 +106,11 @@ def check_for_scams(text: str):
     """
     Analyzes voice text for scam markers using regex keywords.
     """
-    text_lower = text.lower()
-    scam_keywords = ["irs", "gift card", "urgent payment", "password", "social security", "jail"]
-    
-    for word in scam_keywords:
-        if word in text_lower:
-            return {
-                "status": "DANGER",
-                "message": "HANG UP NOW! This is a scam."
-            }
+    if _VOICE_SCAM_RE.search(text):
+        return {
+            "status": "DANGER",
+            "message": "HANG UP NOW! This is a scam."
+        }
             
     return {
         "status": "SAFE",
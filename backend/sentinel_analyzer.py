@@ -3,8 +3,64 @@ Agentic Scam Analyzer for Project Aegis Sentinel Module
 Production-grade fraud detection with LLM integration
 """
 from typing import Dict, List, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 import re
+import threading
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Distinct transcripts whose rule-based verdicts are kept in memory
+ANALYSIS_CACHE_SIZE = 4096
+
+# An indicator pattern that is just word-bounded literals: \b(gift card|irs)\b
+_LITERAL_PATTERN_RE = re.compile(r"\\b\(([^\\()\[\]{}.*+?^$|]+(?:\|[^\\()\[\]{}.*+?^$|]+)*)\)\\b")
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _contains_word(text: str, keyword: str) -> bool:
+    """keyword occurs in text with a word boundary on both sides, like \\b...\\b"""
+    start = text.find(keyword)
+    while start != -1:
+        end = start + len(keyword)
+        if (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end])):
+            return True
+        start = text.find(keyword, start + 1)
+    return False
+
+
+def _is_lowercase(pattern: str) -> bool:
+    # Transcripts are lowercased once (that copy is also the verdict cache key),
+    # so an all-lowercase pattern needs no case-insensitive matching on top
+    return pattern == pattern.lower()
+
+
+def _set_match_bit(pattern_id: int, start: int, end: int, flags: int, matched: List[int]):
+    # Hyperscan match callback; matched is a one-element bitmask holder
+    matched[0] |= 1 << pattern_id
+
+
+def _pattern_matcher(pattern: str):
+    """
+    Callable testing a lowercased ASCII transcript for pattern
+    
+    Plain keyword alternations become substring searches with boundary
+    checks (C-speed str.find, no regex engine); anything else stays a regex.
+    """
+    literal = _LITERAL_PATTERN_RE.fullmatch(pattern)
+    if literal:
+        keywords = [keyword.lower() for keyword in literal.group(1).split("|")]
+        # \b semantics only carry over when keywords start and end on word chars
+        if all(_is_word_char(keyword[0]) and _is_word_char(keyword[-1]) for keyword in keywords):
+            return lambda text: any(_contains_word(text, keyword) for keyword in keywords)
+    return re.compile(pattern, 0 if _is_lowercase(pattern) else re.IGNORECASE).search
 
 
 class AgenticScamAnalyzer:
@@ -75,6 +131,56 @@ class AgenticScamAnalyzer:
             llm_enabled: Whether to use real LLM (future) or rule-based system
         """
         self.llm_enabled = llm_enabled
+        
+        # Every indicator pattern in one Hyperscan database, matched in a single
+        # pass; pattern ids index _patterns. Without hyperscan, each pattern is
+        # tested on its own (keyword search, or re for real regexes).
+        self._patterns = [
+            (category, pattern)
+            for category, config in self.SCAM_INDICATORS.items()
+            for pattern in config["patterns"]
+        ]
+        self._hs_db = None
+        if HYPERSCAN_AVAILABLE:
+            self._hs_db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            self._hs_db.compile(
+                expressions=[pattern.encode() for _, pattern in self._patterns],
+                ids=list(range(len(self._patterns))),
+                flags=[
+                    hyperscan.HS_FLAG_SINGLEMATCH | (0 if _is_lowercase(pattern) else hyperscan.HS_FLAG_CASELESS)
+                    for _, pattern in self._patterns
+                ]
+            )
+            # Scratch space can't be shared by concurrent scans
+            self._hs_local = threading.local()
+            # Matches come back as a bitmask over pattern ids; one mask per category
+            self._category_masks = []
+            for category, config in self.SCAM_INDICATORS.items():
+                mask = 0
+                for pattern_id, (pattern_category, _) in enumerate(self._patterns):
+                    if pattern_category == category:
+                        mask |= 1 << pattern_id
+                self._category_masks.append((category, config["weight"], mask))
+        
+        # Flattened to one (matcher, category, weight, pattern) tuple per
+        # pattern, in SCAM_INDICATORS order: a single loop per transcript
+        self._matchers = tuple(
+            (_pattern_matcher(pattern), category, config["weight"], pattern)
+            for category, config in self.SCAM_INDICATORS.items()
+            for pattern in config["patterns"]
+        )
+        # Hyperscan and the keyword/case-sensitive shortcuts only equal
+        # re.IGNORECASE on ASCII: re's \b is Unicode-aware ("éwarrant" has no
+        # boundary) and its case folding maps "ı" to "i". Non-ASCII transcripts
+        # are matched by these instead.
+        self._unicode_matchers = tuple(
+            (re.compile(pattern, re.IGNORECASE).search, category, weight, pattern)
+            for _, category, weight, pattern in self._matchers
+        )
+        
+        # Rule-based scoring is a pure function of the lowercased transcript,
+        # so repeated transcripts skip the regex scan entirely
+        self._score_cached = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._score)
     
     def analyze(self, transcript: str) -> Dict:
         """
@@ -86,22 +192,65 @@ class AgenticScamAnalyzer:
         Returns:
             Dict with fraud_score, indicators, action, and reasoning
         """
-        transcript_lower = transcript.lower()
+        fraud_score, indicators, action, reasoning = self._score_cached(transcript.lower())
+        
+        return {
+            "fraud_score": fraud_score,
+            "indicators": [dict(indicator) for indicator in indicators],
+            "action": action,
+            "reasoning": reasoning,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "analysis_method": "LLM" if self.llm_enabled else "RULE_BASED"
+        }
+    
+    def cache_info(self):
+        """Hit/miss statistics for the transcript verdict cache"""
+        return self._score_cached.cache_info()
+    
+    def _hyperscan_matches(self, transcript_lower: str) -> int:
+        """Bitmask (bit = pattern id) of every pattern that matches, from one Hyperscan pass"""
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
         
+        matched = [0]
+        self._hs_db.scan(
+            transcript_lower.encode(),
+            match_event_handler=_set_match_bit,
+            context=matched,
+            scratch=scratch
+        )
+        return matched[0]
+    
+    def _score(self, transcript_lower: str) -> Tuple[float, Tuple[Dict, ...], str, str]:
+        """Score a lowercased transcript; returns (score, indicators, action, reasoning)"""
         # Detect indicators
         detected_indicators = []
         total_score = 0
         
-        for category, config in self.SCAM_INDICATORS.items():
-            for pattern in config["patterns"]:
-                if re.search(pattern, transcript_lower, re.IGNORECASE):
-                    detected_indicators.append({
-                        "category": category,
-                        "pattern": pattern,
-                        "weight": config["weight"]
-                    })
-                    total_score += config["weight"]
-                    break  # Only count each category once
+        is_ascii = transcript_lower.isascii()
+        if self._hs_db is not None and is_ascii:
+            matched = self._hyperscan_matches(transcript_lower)
+            for category, weight, category_mask in self._category_masks:
+                hits = matched & category_mask
+                if hits:
+                    # Ids ascend in SCAM_INDICATORS order, so the lowest set bit
+                    # is the pattern the re loop would have stopped at
+                    pattern = self._patterns[(hits & -hits).bit_length() - 1][1]
+                    detected_indicators.append({"category": category, "pattern": pattern, "weight": weight})
+                    total_score += weight
+        else:
+            seen = set()
+            for matches, category, weight, pattern in self._matchers if is_ascii else self._unicode_matchers:
+                if category in seen or not matches(transcript_lower):
+                    continue
+                seen.add(category)  # Only count each category once
+                detected_indicators.append({
+                    "category": category,
+                    "pattern": pattern,
+                    "weight": weight
+                })
+                total_score += weight
         
         # Normalize score to 0-100
         fraud_score = min(100, total_score)
@@ -109,14 +258,7 @@ class AgenticScamAnalyzer:
         # Determine action
         action, reasoning = self._determine_action(fraud_score, detected_indicators)
         
-        return {
-            "fraud_score": fraud_score,
-            "indicators": detected_indicators,
-            "action": action,
-            "reasoning": reasoning,
-            "timestamp": datetime.utcnow().isoformat(),
-            "analysis_method": "LLM" if self.llm_enabled else "RULE_BASED"
-        }
+        return fraud_score, tuple(detected_indicators), action, reasoning
     
     def _determine_action(self, score: float, indicators: List[Dict]) -> Tuple[str, str]:
         """
@@ -2,17 +2,19 @@
 Project Aegis: Sentinel Module API
 Production-grade FastAPI backend for scam detection and transaction governance
 """
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from typing import Any, Dict, Optional, List
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 # Import custom modules
-from models import Base, SecurityLog, PendingApproval
+from db import engine, get_async_db as get_db
+from models import Base, SecurityLog, PendingApproval, SECURITY_LOG_SUMMARY_COLUMNS, PENDING_APPROVAL_COLUMNS
 from sentinel_analyzer import AgenticScamAnalyzer
 from transaction_governor import ContextAwareGovernor
 from advocate_notifier import TrustedAdvocateNotifier
@@ -28,7 +30,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Project Aegis - Sentinel Module",
     description="AI-powered scam detection and transaction governance",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -40,16 +43,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database setup
-DATABASE_URL = "sqlite:///./data/aegis_trust_vault.db"
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False},
-    poolclass=None  # Disable connection pooling for SQLite
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create tables
+# Create tables (engines are shared with the other routers via db.py)
 Base.metadata.create_all(bind=engine)
 
 # Initialize services
@@ -58,15 +52,6 @@ transaction_governor = ContextAwareGovernor()
 advocate_notifier = TrustedAdvocateNotifier(webhook_url=None)
 
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ============================================================================
 # REQUEST/RESPONSE MODELS
 # ============================================================================
@@ -75,7 +60,7 @@ class VoiceInterceptRequest(BaseModel):
     """Request model for voice call interception"""
     transcript: str = Field(..., description="Real-time text transcript of the call")
     user_id: Optional[str] = Field(None, description="Protected user identifier")
-    call_metadata: Optional[dict] = Field(None, description="Additional call metadata")
+    call_metadata: Optional[Dict[str, Any]] = Field(None, description="Additional call metadata")
 
 
 class VoiceInterceptResponse(BaseModel):
@@ -95,7 +80,7 @@ class TransactionMonitorRequest(BaseModel):
     category: str = Field(..., description="Transaction category")
     merchant: str = Field(..., description="Merchant name")
     user_id: Optional[str] = Field(None, description="User identifier")
-    transaction_metadata: Optional[dict] = Field(None, description="Additional metadata")
+    transaction_metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
 class TransactionMonitorResponse(BaseModel):
@@ -117,7 +102,8 @@ class TransactionMonitorResponse(BaseModel):
 @app.post("/sentinel/voice/intercept", response_model=VoiceInterceptResponse)
 async def intercept_voice_call(
     request: VoiceInterceptRequest,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Scam Interceptor Endpoint
@@ -143,14 +129,11 @@ async def intercept_voice_call(
             event_metadata=request.call_metadata
         )
         
-        db.add(security_log)
-        db.commit()
-        db.refresh(security_log)
-        
-        # Notify advocate if high risk
+        # Notify advocate if high risk (sent after the response, outside the transaction)
         advocate_notified = False
         if analysis["fraud_score"] > 50:
-            await advocate_notifier.notify_scam_detected(
+            background_tasks.add_task(
+                advocate_notifier.notify_scam_detected,
                 user_id=request.user_id or "unknown",
                 fraud_score=analysis["fraud_score"],
                 action=analysis["action"],
@@ -160,7 +143,11 @@ async def intercept_voice_call(
             advocate_notified = True
             security_log.advocate_notified = True
             security_log.advocate_notification_time = datetime.utcnow()
-            db.commit()
+        
+        # Single commit per request
+        db.add(security_log)
+        await db.commit()
+        security_log_id = security_log.id
         
         logger.info(
             f"Call analysis complete: Score={analysis['fraud_score']}, "
@@ -172,7 +159,7 @@ async def intercept_voice_call(
             action=analysis["action"],
             reasoning=analysis["reasoning"],
             indicators=analysis["indicators"],
-            security_log_id=security_log.id,
+            security_log_id=security_log_id,
             advocate_notified=advocate_notified
         )
         
@@ -184,7 +171,8 @@ async def intercept_voice_call(
 @app.post("/sentinel/transactions/monitor", response_model=TransactionMonitorResponse)
 async def monitor_transaction(
     request: TransactionMonitorRequest,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Spending Governance Endpoint
@@ -211,7 +199,8 @@ async def monitor_transaction(
         security_log = SecurityLog(
             event_type="TRANSACTION",
             transaction_amount=request.amount,
-            transaction_time=request.transaction_time,
+            # DateTime columns are naive; keep the wall time the governor judged
+            transaction_time=request.transaction_time.replace(tzinfo=None),
             transaction_category=request.category,
             merchant=request.merchant,
             risk_level=analysis["risk_level"],
@@ -226,8 +215,8 @@ async def monitor_transaction(
         )
         
         db.add(security_log)
-        db.commit()
-        db.refresh(security_log)
+        await db.flush()  # assigns security_log.id without committing
+        security_log_id = security_log.id
         
         # Create pending approval if needed
         approval_id = None
@@ -235,15 +224,15 @@ async def monitor_transaction(
         
         if analysis["status"] == "PENDING_APPROVAL":
             pending_approval = PendingApproval(
-                security_log_id=security_log.id
+                security_log_id=security_log_id
             )
             db.add(pending_approval)
-            db.commit()
-            db.refresh(pending_approval)
+            await db.flush()
             approval_id = pending_approval.id
             
-            # Notify advocate
-            await advocate_notifier.notify_transaction_pending(
+            # Notify advocate once the response is sent
+            background_tasks.add_task(
+                advocate_notifier.notify_transaction_pending,
                 user_id=request.user_id or "unknown",
                 amount=request.amount,
                 merchant=request.merchant,
@@ -255,7 +244,9 @@ async def monitor_transaction(
             advocate_notified = True
             security_log.advocate_notified = True
             security_log.advocate_notification_time = datetime.utcnow()
-            db.commit()
+        
+        # Security log and pending approval land in one transaction
+        await db.commit()
         
         logger.info(
             f"Transaction analysis complete: Risk={analysis['risk_level']}, "
@@ -268,7 +259,7 @@ async def monitor_transaction(
             status=analysis["status"],
             reasoning=analysis["reasoning"],
             flags=analysis["flags"],
-            security_log_id=security_log.id,
+            security_log_id=security_log_id,
             approval_id=approval_id,
             advocate_notified=advocate_notified
         )
@@ -289,68 +280,62 @@ async def root():
         "service": "Project Aegis - Sentinel Module",
         "status": "operational",
         "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
 
 
+# Upper bound on rows per /sentinel/logs page
+MAX_LOG_PAGE = 500
+
+
 @app.get("/sentinel/logs")
 async def get_security_logs(
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=MAX_LOG_PAGE),
     event_type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get security logs for audit trail"""
-    query = db.query(SecurityLog)
+    # Project only the listed columns instead of hydrating full ORM rows
+    query = select(*SECURITY_LOG_SUMMARY_COLUMNS)
     
     if event_type:
-        query = query.filter(SecurityLog.event_type == event_type)
+        query = query.where(SecurityLog.event_type == event_type)
     
-    logs = query.order_by(SecurityLog.timestamp.desc()).limit(limit).all()
+    rows = (await db.execute(query.order_by(SecurityLog.timestamp.desc()).limit(limit))).all()
     
     return {
-        "count": len(logs),
-        "logs": [
-            {
-                "id": log.id,
-                "event_type": log.event_type,
-                "timestamp": log.timestamp.isoformat(),
-                "fraud_score": log.fraud_score,
-                "risk_level": log.risk_level,
-                "action_taken": log.action_taken,
-                "approval_status": log.approval_status,
-                "advocate_notified": log.advocate_notified
-            }
-            for log in logs
-        ]
+        "count": len(rows),
+        "logs": [dict(row._mapping) for row in rows]
     }
 
 
 @app.get("/sentinel/approvals/pending")
-async def get_pending_approvals(db: Session = Depends(get_db)):
+async def get_pending_approvals(db: AsyncSession = Depends(get_db)):
     """Get all pending approvals for Trusted Advocate review"""
-    approvals = db.query(PendingApproval).filter(
-        PendingApproval.decision == None
-    ).all()
+    # One JOIN instead of a SecurityLog lookup per approval, projecting only
+    # the columns the queue shows (skips transcript / metadata JSON)
+    rows = (await db.execute(
+        select(*PENDING_APPROVAL_COLUMNS).join(
+            SecurityLog, SecurityLog.id == PendingApproval.security_log_id
+        ).where(
+            PendingApproval.decision.is_(None)
+        )
+    )).all()
     
     result = []
-    for approval in approvals:
-        log = db.query(SecurityLog).filter(
-            SecurityLog.id == approval.security_log_id
-        ).first()
-        
-        if log:
-            result.append({
-                "approval_id": approval.id,
-                "created_at": approval.created_at.isoformat(),
-                "transaction": {
-                    "amount": log.transaction_amount,
-                    "merchant": log.merchant,
-                    "category": log.transaction_category,
-                    "time": log.transaction_time.isoformat() if log.transaction_time else None
-                },
-                "risk_level": log.risk_level,
-                "reasoning": log.reasoning
-            })
+    for row in rows:
+        result.append({
+            "approval_id": row.id,
+            "created_at": row.created_at,
+            "transaction": {
+                "amount": row.transaction_amount,
+                "merchant": row.merchant,
+                "category": row.transaction_category,
+                "time": row.transaction_time
+            },
+            "risk_level": row.risk_level,
+            "reasoning": row.reasoning
+        })
     
     return {"count": len(result), "approvals": result}
 
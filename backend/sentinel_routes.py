@@ -0,0 +1,268 @@
+"""
+Project Aegis: Sentinel Module - FastAPI Router
+Scam interception, transaction governance and the security audit trail
+"""
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import ORJSONResponse, Response
+from collections import OrderedDict
+from datetime import datetime
+import os
+import sqlite3
+import orjson
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import engine, get_async_engine, get_async_db as get_db
+from models import Base, SecurityLog, PendingApproval, SECURITY_LOG_SUMMARY_COLUMNS, PENDING_APPROVAL_COLUMNS
+from sentinel_analyzer import AgenticScamAnalyzer
+from transaction_governor import ContextAwareGovernor
+from advocate_notifier import TrustedAdvocateNotifier
+from request_models import VoiceInterceptRequest, TransactionMonitorRequest
+from security_log_batcher import SecurityLogBatcher
+
+# Router (dict results are serialized by orjson without response-model validation)
+router = APIRouter(tags=["Sentinel"], default_response_class=ORJSONResponse)
+
+# Initialize Sentinel components
+scam_analyzer = AgenticScamAnalyzer(llm_enabled=False)
+transaction_governor = ContextAwareGovernor()
+advocate_notifier = TrustedAdvocateNotifier(webhook_url=None)
+
+# Bound methods for the hot endpoints (skips the global + attribute lookup per call)
+_analyze = scam_analyzer.analyze
+_governor_analyze = transaction_governor.analyze_transaction
+_notify_scam = advocate_notifier.notify_scam_detected
+_notify_txn = advocate_notifier.notify_transaction_pending
+
+# Hot writes use INSERT ... RETURNING, available from SQLite 3.35. RuntimeError,
+# not ImportError: main.py would silently drop the Sentinel routes on an ImportError.
+if engine.dialect.name == "sqlite" and sqlite3.sqlite_version_info < (3, 35, 0):
+    raise RuntimeError(f"Sentinel requires SQLite 3.35+ for INSERT ... RETURNING (found {sqlite3.sqlite_version})")
+
+# Core inserts for the hot endpoints (no identity map or attribute tracking)
+_INSERT_SECURITY_LOG = insert(SecurityLog).returning(SecurityLog.id)
+_INSERT_PENDING_APPROVAL = insert(PendingApproval).returning(PendingApproval.id)
+
+# Database setup for Sentinel (engines are shared with the other routers via db.py)
+Base.metadata.create_all(bind=engine)
+
+class _JSONFragmentCache:
+    """Bounded LRU of serialized rows keyed by primary key"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+    
+    def get(self, key):
+        fragment = self._data.get(key)
+        if fragment is not None:
+            self._data.move_to_end(key)
+        return fragment
+    
+    def put(self, key, fragment: bytes):
+        self._data[key] = fragment
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+# Upper bound on rows per /sentinel/logs page
+MAX_LOG_PAGE = 500
+
+# Security logs are never updated after insert, so each /sentinel/logs row is
+# serialized once and reused from here
+LOG_JSON_CACHE_SIZE = 10_000
+_log_json_cache = _JSONFragmentCache(LOG_JSON_CACHE_SIZE)
+
+# Opt-in (BATCH_SECURITY_LOGS=1): coalesce scam-call log inserts across
+# concurrent requests. A row only becomes visible once its batch commits.
+security_log_batcher = (
+    SecurityLogBatcher(get_async_engine()) if os.getenv("BATCH_SECURITY_LOGS") == "1" else None
+)
+
+@router.post("/sentinel/voice/intercept", response_model=None)
+async def intercept_voice_call(request: VoiceInterceptRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+    """Scam Interceptor Endpoint"""
+    # Analyze transcript
+    analysis = _analyze(request.transcript)
+    
+    # Security log row (every key always present so batched rows line up)
+    log_values = {
+        "event_type": "SCAM_CALL",
+        "transcript": request.transcript,
+        "fraud_score": analysis["fraud_score"],
+        "scam_indicators": analysis["indicators"],
+        "action_taken": analysis["action"],
+        "reasoning": analysis["reasoning"],
+        "user_id": request.user_id,
+        "event_metadata": request.call_metadata,
+        "advocate_notified": False,
+        "advocate_notification_time": None
+    }
+    
+    # Notify advocate if high risk (sent after the response, outside the transaction)
+    advocate_notified = False
+    if analysis["fraud_score"] > 50:
+        background_tasks.add_task(
+            _notify_scam,
+            user_id=request.user_id,
+            fraud_score=analysis["fraud_score"],
+            action=analysis["action"],
+            reasoning=analysis["reasoning"],
+            transcript=request.transcript
+        )
+        advocate_notified = True
+        log_values["advocate_notified"] = True
+        log_values["advocate_notification_time"] = datetime.utcnow()
+    
+    if security_log_batcher is not None:
+        security_log_id = await security_log_batcher.submit(log_values)
+    else:
+        # RETURNING hands back the id in the same round-trip as the insert
+        result = await db.execute(_INSERT_SECURITY_LOG.values(log_values))
+        security_log_id = result.scalar_one()
+        await db.commit()
+    
+    return {
+        "fraud_score": analysis["fraud_score"],
+        "action": analysis["action"],
+        "reasoning": analysis["reasoning"],
+        "indicators": analysis["indicators"],
+        "security_log_id": security_log_id,
+        "advocate_notified": advocate_notified
+    }
+
+@router.post("/sentinel/transactions/monitor", response_model=None)
+async def monitor_transaction(request: TransactionMonitorRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+    """Spending Governance Endpoint"""
+    # Analyze transaction
+    analysis = _governor_analyze(
+        amount=request.amount,
+        transaction_time=request.transaction_time,
+        category=request.category,
+        merchant=request.merchant,
+        user_id=request.user_id
+    )
+    
+    # Pending transactions notify the advocate, so the log records it up front
+    needs_approval = analysis["status"] == "PENDING_APPROVAL"
+    
+    # Create security log
+    result = await db.execute(_INSERT_SECURITY_LOG.values(
+        event_type="TRANSACTION",
+        transaction_amount=request.amount,
+        # DateTime columns are naive; keep the wall time the governor judged
+        transaction_time=request.transaction_time.replace(tzinfo=None),
+        transaction_category=request.category,
+        merchant=request.merchant,
+        risk_level=analysis["risk_level"],
+        approval_status=analysis["status"],
+        reasoning=analysis["reasoning"],
+        user_id=request.user_id,
+        event_metadata={
+            "flags": analysis["flags"],
+            "risk_score": analysis["risk_score"],
+            **(request.transaction_metadata or {})
+        },
+        advocate_notified=needs_approval,
+        advocate_notification_time=datetime.utcnow() if needs_approval else None
+    ))
+    security_log_id = result.scalar_one()
+    
+    # Create pending approval if needed
+    approval_id = None
+    advocate_notified = False
+    
+    if needs_approval:
+        result = await db.execute(_INSERT_PENDING_APPROVAL.values(security_log_id=security_log_id))
+        approval_id = result.scalar_one()
+        
+        # Notify advocate once the response is sent
+        background_tasks.add_task(
+            _notify_txn,
+            user_id=request.user_id,
+            amount=request.amount,
+            merchant=request.merchant,
+            category=request.category,
+            risk_level=analysis["risk_level"],
+            reasoning=analysis["reasoning"],
+            approval_id=approval_id
+        )
+        advocate_notified = True
+    
+    # Security log and pending approval land in one transaction
+    await db.commit()
+    
+    return {
+        "risk_level": analysis["risk_level"],
+        "risk_score": analysis["risk_score"],
+        "status": analysis["status"],
+        "reasoning": analysis["reasoning"],
+        "flags": analysis["flags"],
+        "security_log_id": security_log_id,
+        "approval_id": approval_id,
+        "advocate_notified": advocate_notified
+    }
+
+@router.get("/sentinel/logs", response_model=None)
+async def get_security_logs(limit: int = Query(50, ge=1, le=MAX_LOG_PAGE), event_type: str = None, db: AsyncSession = Depends(get_db)):
+    """Get security logs for audit trail"""
+    # Page through ids only; the (event_type, timestamp) index covers this
+    query = select(SecurityLog.id)
+    
+    if event_type:
+        query = query.where(SecurityLog.event_type == event_type)
+    
+    result = await db.execute(query.order_by(SecurityLog.timestamp.desc()).limit(limit))
+    log_ids = result.scalars().all()
+    
+    # Serve already-serialized rows from the cache, load and cache the rest
+    fragments = {}
+    for log_id in log_ids:
+        fragment = _log_json_cache.get(log_id)
+        if fragment is not None:
+            fragments[log_id] = fragment
+    
+    missing = [log_id for log_id in log_ids if log_id not in fragments]
+    if missing:
+        result = await db.execute(
+            select(*SECURITY_LOG_SUMMARY_COLUMNS).where(SecurityLog.id.in_(missing))
+        )
+        for row in result:
+            fragment = orjson.dumps(dict(row._mapping))
+            _log_json_cache.put(row.id, fragment)
+            fragments[row.id] = fragment
+    
+    body = b'{"count":%d,"logs":[%s]}' % (
+        len(log_ids), b",".join(fragments[log_id] for log_id in log_ids)
+    )
+    return Response(content=body, media_type="application/json")
+
+@router.get("/sentinel/approvals/pending", response_model=None)
+async def get_pending_approvals(db: AsyncSession = Depends(get_db)):
+    """Get all pending approvals for Trusted Advocate review"""
+    # One JOIN instead of a SecurityLog lookup per approval, projecting only
+    # the columns the queue shows (skips transcript / metadata JSON)
+    rows = (await db.execute(
+        select(*PENDING_APPROVAL_COLUMNS).join(
+            SecurityLog, SecurityLog.id == PendingApproval.security_log_id
+        ).where(
+            PendingApproval.decision.is_(None)
+        )
+    )).all()
+    
+    result = []
+    for row in rows:
+        result.append({
+            "approval_id": row.id,
+            "created_at": row.created_at,
+            "transaction": {
+                "amount": row.transaction_amount,
+                "merchant": row.merchant,
+                "category": row.transaction_category,
+                "time": row.transaction_time
+            },
+            "risk_level": row.risk_level,
+            "reasoning": row.reasoning
+        })
+    
+    return {"count": len(result), "approvals": result}
@@ -0,0 +1,162 @@
+"""
+Test Suite for the Project Aegis main app
+Tests the legacy steward, scan and batch analysis endpoints
+"""
+import queue
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+import database
+import db_pool
+import main
+import sentinel
+import sentinel_routes
+from models import Base, SecurityLog, SECURITY_LOG_SUMMARY_COLUMNS
+
+
+# ============================================================================
+# TEST FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def steward_db(tmp_path, monkeypatch):
+    """Point the legacy steward tables (and their pool) at a fresh database"""
+    path = str(tmp_path / "trust_vault.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    monkeypatch.setattr(db_pool, "DB_PATH", path)
+    monkeypatch.setattr(db_pool, "_pool", queue.LifoQueue(maxsize=db_pool.POOL_SIZE))
+    database.init_db()
+    return path
+
+
+@pytest.fixture
+def sentinel_db(tmp_path, monkeypatch):
+    """Fresh Sentinel tables for the main app's Sentinel router"""
+    db_path = tmp_path / "sentinel_test.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    async_session = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool), expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with async_session() as db:
+            yield db
+
+    # Log ids restart at 1, so serialized rows from earlier tests must not be served
+    monkeypatch.setattr(sentinel_routes, "_log_json_cache", sentinel_routes._JSONFragmentCache(100))
+    main.app.dependency_overrides[sentinel_routes.get_db] = override_get_db
+    yield engine
+    main.app.dependency_overrides.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(steward_db, sentinel_db):
+    return TestClient(main.app)
+
+
+# ============================================================================
+# STEWARD TESTS
+# ============================================================================
+
+class TestStewardReview:
+    """Test suite for /steward/review/bulk"""
+
+    def test_bulk_review_updates_every_item(self, client):
+        main.add_pending_bills_bulk([("Electric", 120.0, "over limit"), ("Water", 80.0, "over limit"), ("Gas", 60.0, "new")])
+
+        response = client.post("/steward/review/bulk", json={"items": [
+            {"item_id": 1, "decision": "APPROVE"}, {"item_id": 2, "decision": "REJECT"}
+        ]})
+
+        assert response.status_code == 200
+        assert response.json()["reviewed"] == 2
+        assert [item["id"] for item in client.get("/steward/pending").json()] == [3]
+        with db_pool.get_conn() as conn:
+            assert conn.execute("SELECT id, status FROM pending_bills ORDER BY id").fetchall() == [
+                (1, "APPROVE"), (2, "REJECT"), (3, "PENDING")
+            ]
+
+    def test_unknown_decision_is_rejected(self, client):
+        main.add_pending_bills_bulk([("Electric", 120.0, "over limit"), ("Water", 80.0, "over limit")])
+
+        response = client.post("/steward/review/bulk", json={"items": [
+            {"item_id": 1, "decision": "APPROVE"}, {"item_id": 2, "decision": "MAYBE"}
+        ]})
+
+        assert response.status_code == 422
+        assert len(client.get("/steward/pending").json()) == 2
+
+
+# ============================================================================
+# SENTINEL ANALYSIS TESTS
+# ============================================================================
+
+class TestSecurityLogs:
+    """Test suite for /sentinel/logs (rows are served as cached JSON fragments)"""
+
+    def _expected(self, sentinel_db, limit=50):
+        with sentinel_db.connect() as conn:
+            rows = conn.execute(
+                select(*SECURITY_LOG_SUMMARY_COLUMNS).order_by(SecurityLog.timestamp.desc()).limit(limit)
+            ).all()
+        return orjson.loads(orjson.dumps({"count": len(rows), "logs": [dict(row._mapping) for row in rows]}))
+
+    def test_assembled_body_matches_rows(self, client, sentinel_db):
+        for transcript in ("IRS here, pay with gift cards now", "Hi grandma, see you Sunday"):
+            assert client.post("/sentinel/voice/intercept", json={"transcript": transcript}).status_code == 200
+
+        first = client.get("/sentinel/logs")
+        client.post("/sentinel/voice/intercept", json={"transcript": "Urgent payment needed or you go to jail"})
+        second = client.get("/sentinel/logs")
+
+        assert first.status_code == second.status_code == 200
+        assert first.headers["content-type"] == "application/json"
+        assert second.json() == self._expected(sentinel_db)
+        assert second.json()["logs"][1:] == first.json()["logs"]
+
+    def test_limit_applies_to_cached_rows(self, client, sentinel_db):
+        for i in range(3):
+            client.post("/sentinel/voice/intercept", json={"transcript": f"call {i}"})
+        client.get("/sentinel/logs")
+
+        response = client.get("/sentinel/logs", params={"limit": 2})
+
+        assert response.json() == self._expected(sentinel_db, limit=2)
+
+
+    def test_fragment_cache_evicts_least_recently_used(self):
+        cache = sentinel_routes._JSONFragmentCache(2)
+        cache.put(1, b"1")
+        cache.put(2, b"2")
+        cache.get(1)
+        cache.put(3, b"3")
+
+        assert [cache.get(key) for key in (1, 2, 3)] == [b"1", None, b"3"]
+
+
+class TestAnalyzeBatch:
+    """Test suite for /sentinel/analyze/batch"""
+
+    def test_results_follow_input_order(self, client, monkeypatch):
+        monkeypatch.setattr(sentinel, "client", None)
+
+        response = client.post("/sentinel/analyze/batch", json={"texts": ["Buy gift cards now", "See you at lunch"]})
+
+        assert response.status_code == 200
+        assert [result["classification"] for result in response.json()["results"]] == ["Confirmed Scam", "Safe"]
+
+    def test_oversized_batch_is_rejected(self, client, monkeypatch):
+        monkeypatch.setattr(sentinel, "client", None)
+
+        response = client.post(
+            "/sentinel/analyze/batch", json={"texts": ["hello"] * (main.MAX_TRANSCRIPT_BATCH + 1)}
+        )
+
+        assert response.status_code == 422
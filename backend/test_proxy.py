@@ -0,0 +1,526 @@
+"""
+Test Suite for Project Aegis Module C (The Proxy)
+Tests the audit hash chain, Merkle seals, signatures and token encryption
+"""
+import base64
+import hashlib
+import io
+import threading
+import zipfile
+
+import pytest
+from cryptography.exceptions import InvalidTag
+from sqlalchemy import create_engine, update
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import joinedload, sessionmaker
+
+import proxy_models  # noqa: F401 - registers the Proxy tables on Base
+import proxy_vault
+from database import enable_sqlite_pragmas
+from models import Base
+from audit_log_batcher import AuditLogBatcher
+from poa_cache import POAStateCache
+from proxy_audit import FiduciaryLogger, merkle_proof
+from proxy_models import AuditAnchor, AuditLog
+from proxy_vault import SmartPOAManager, TokenGatekeeper, get_vault_encryption, audit_message, _legacy_sign
+
+
+# ============================================================================
+# TEST FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def engine(tmp_path):
+    """File-backed SQLite engine, configured like the app's"""
+    engine = enable_sqlite_pragmas(create_engine(
+        f"sqlite:///{tmp_path / 'proxy_test.db'}",
+        connect_args={"check_same_thread": False}
+    ))
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def poa_id(session_factory):
+    """A utilities POA (its creation is the first link of its chain)"""
+    with session_factory() as db:
+        return SmartPOAManager(db).create_poa("senior_001", "agent_001", "utilities", 100.0).id
+
+
+@pytest.fixture
+def client(session_factory):
+    """Test client for the Proxy router on the test database"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    import proxy_api
+
+    app = FastAPI()
+    app.include_router(proxy_api.router)
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[proxy_api.get_db] = override_get_db
+    return TestClient(app)
+
+
+def _log_entry(poa_id, i):
+    return {
+        "poa_id": poa_id,
+        "action_type": "REQUEST_ACCESS",
+        "decision": "ALLOWED",
+        "reasoning": f"request {i}",
+        "request_details": {"i": i}
+    }
+
+
+# ============================================================================
+# AUDIT CHAIN TESTS
+# ============================================================================
+
+class TestAuditChain:
+    """Test suite for the per-POA audit hash chain"""
+
+    def test_chain_verifies(self, session_factory, poa_id):
+        """Logs from every writer link into one valid chain"""
+        with session_factory() as db:
+            FiduciaryLogger(db).create_log(**_log_entry(poa_id, 0))
+            FiduciaryLogger(db).create_logs_bulk([_log_entry(poa_id, i) for i in range(1, 4)])
+            SmartPOAManager(db).revoke_poa(poa_id, "test", "senior_001")
+
+            result = FiduciaryLogger(db).verify_chain(poa_id)
+
+        assert result["valid"] is True
+        assert result["entries_checked"] == 6
+
+    def test_tampered_log_breaks_chain(self, session_factory, poa_id):
+        """Editing a logged decision is reported at that log"""
+        with session_factory() as db:
+            log_ids = FiduciaryLogger(db).create_logs_bulk([_log_entry(poa_id, i) for i in range(3)])
+            db.execute(update(AuditLog).where(AuditLog.id == log_ids[1]).values(decision="BLOCKED"))
+            db.commit()
+
+            result = FiduciaryLogger(db).verify_chain(poa_id)
+
+        assert result["valid"] is False
+        assert result["broken_at_log_id"] == log_ids[1]
+
+    def test_chain_endpoint_reports_deleted_log(self, client, session_factory, poa_id):
+        """Dropping a log breaks the link of the one after it"""
+        with session_factory() as db:
+            log_ids = FiduciaryLogger(db).create_logs_bulk([_log_entry(poa_id, i) for i in range(3)])
+
+        assert client.get(f"/proxy/audit/chain/{poa_id}").json()["valid"] is True
+
+        with session_factory() as db:
+            db.query(AuditLog).filter(AuditLog.id == log_ids[1]).delete()
+            db.commit()
+
+        result = client.get(f"/proxy/audit/chain/{poa_id}").json()
+        assert result["valid"] is False
+        assert result["broken_at_log_id"] == log_ids[2]
+
+    def test_concurrent_writers_keep_one_chain(self, engine, session_factory, poa_id):
+        """Threads writing to one POA never fork its chain"""
+        batcher = AuditLogBatcher(engine, max_batch=8)
+        errors = []
+
+        def write(worker):
+            try:
+                with session_factory() as db:
+                    manager = SmartPOAManager(db)
+                    batched = SmartPOAManager(db, batcher)
+                    logger = FiduciaryLogger(db)
+                    for i in range(20):
+                        if i % 4 == 0:
+                            logger.create_logs_bulk([_log_entry(poa_id, i), _log_entry(poa_id, i + 1)])
+                        elif i % 4 == 1:
+                            batched._create_audit_log(**_log_entry(poa_id, i))
+                        else:
+                            manager._create_audit_log(**_log_entry(poa_id, i))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.stop()
+
+        with session_factory() as db:
+            result = FiduciaryLogger(db).verify_chain(poa_id)
+
+        assert errors == []
+        assert result["valid"] is True
+        assert result["entries_checked"] == 1 + 8 * 25
+
+    def test_conflicting_head_is_relinked(self, session_factory, poa_id, monkeypatch):
+        """A write linked to a stale head hits the unique link and is retried"""
+        real_head = proxy_vault.audit_chain_head
+        reads = []
+
+        def stale_once(db, poa_id):
+            reads.append(poa_id)
+            return proxy_vault.GENESIS_HASH if len(reads) == 1 else real_head(db, poa_id)
+
+        monkeypatch.setattr(proxy_vault, "audit_chain_head", stale_once)
+        with session_factory() as db:
+            FiduciaryLogger(db).create_log(**_log_entry(poa_id, 0))
+            result = FiduciaryLogger(db).verify_chain(poa_id)
+
+        assert len(reads) == 2
+        assert result["valid"] is True
+        assert result["entries_checked"] == 2
+
+
+# ============================================================================
+# MERKLE SEAL TESTS
+# ============================================================================
+
+class TestMerkleSeal:
+    """Test suite for sealed Merkle roots and inclusion paths"""
+
+    def test_inclusion_paths_lead_to_root(self, session_factory, poa_id):
+        """Every log's inclusion path rebuilds the signed root"""
+        with session_factory() as db:
+            logger = FiduciaryLogger(db)
+            logger.create_logs_bulk([_log_entry(poa_id, i) for i in range(6)])
+            anchor, log_ids, levels = logger.seal_trail(poa_id)
+            logs = {log.id: log for log in db.query(AuditLog).filter(AuditLog.poa_id == poa_id)}
+            root, signature, leaf_count = anchor.merkle_root, anchor.signature, anchor.leaf_count
+
+        assert leaf_count == len(log_ids) == 7
+        assert get_vault_encryption().verify_bytes(root.encode(), signature)
+
+        for index, log_id in enumerate(log_ids):
+            log = logs[log_id]
+            node = hashlib.sha256(b"\x00" + audit_message(
+                poa_id, log.action_type, log.timestamp, log.decision, log.request_details
+            )).digest()
+            for step in merkle_proof(levels, index):
+                side, sibling = step.split(":")
+                pair = bytes.fromhex(sibling) + node if side == "L" else node + bytes.fromhex(sibling)
+                node = hashlib.sha256(b"\x01" + pair).digest()
+            assert node.hex() == root
+
+
+# ============================================================================
+# RELATIONSHIP LOADING TESTS
+# ============================================================================
+
+class TestRelationshipLoading:
+    """Test suite for the raise_on_sql relationship strategy"""
+
+    def test_unloaded_children_raise_instead_of_querying(self, session_factory, poa_id):
+        with session_factory() as db:
+            poa = SmartPOAManager(db).get_poa(poa_id)
+            with pytest.raises(InvalidRequestError):
+                poa.tokens
+            with pytest.raises(InvalidRequestError):
+                poa.audit_logs
+
+    def test_load_children_fetches_tokens_up_front(self, session_factory, poa_id):
+        with session_factory() as db:
+            manager = SmartPOAManager(db)
+            manager.store_oauth_tokens(poa_id, [{"service_name": "AT&T", "token": "att-token"}])
+        with session_factory() as db:
+            poa = SmartPOAManager(db).get_poa(poa_id, load_children=True)
+            db.expunge(poa)
+
+        assert [token.service_name for token in poa.tokens] == ["AT&T"]
+
+    def test_eager_loaded_parent_is_available(self, session_factory, poa_id):
+        with session_factory() as db:
+            log_id = db.query(AuditLog.id).filter(AuditLog.poa_id == poa_id).scalar()
+            log = db.get(AuditLog, log_id, options=[joinedload(AuditLog.poa)])
+            db.expunge(log)
+
+        assert log.poa.id == poa_id
+
+
+# ============================================================================
+# AUDIT API TESTS
+# ============================================================================
+
+class TestAuditBatchAPI:
+    """Test suite for /proxy/audit/logs/batch"""
+
+    def test_client_entries_are_marked(self, client, session_factory, poa_id):
+        response = client.post("/proxy/audit/logs/batch", json={"entries": [{
+            "poa_id": poa_id, "action_type": "TRANSACTION", "decision": "ALLOWED",
+            "reasoning": "Paid AT&T bill", "request_details": {"source": "gatekeeper"}
+        }]})
+
+        assert response.status_code == 200
+        with session_factory() as db:
+            log = db.get(AuditLog, response.json()["log_ids"][0])
+            assert log.request_details == {"source": "client_batch"}
+            assert FiduciaryLogger(db).verify_chain(poa_id)["valid"] is True
+
+    @pytest.mark.parametrize("action_type, decision", [("FORGED", "ALLOWED"), ("TRANSACTION", "BREAK_GLASS")])
+    def test_server_only_entries_are_rejected(self, client, session_factory, poa_id, action_type, decision):
+        response = client.post("/proxy/audit/logs/batch", json={"entries": [{
+            "poa_id": poa_id, "action_type": action_type, "decision": decision, "reasoning": "forged"
+        }]})
+
+        assert response.status_code == 400
+        with session_factory() as db:
+            assert FiduciaryLogger(db).verify_chain(poa_id)["entries_checked"] == 1
+
+    def test_empty_batch_is_rejected(self, client):
+        response = client.post("/proxy/audit/logs/batch", json={"entries": []})
+
+        assert response.status_code == 422
+
+    def test_empty_bulk_writes_nothing(self, session_factory, poa_id):
+        with session_factory() as db:
+            assert FiduciaryLogger(db).create_logs_bulk([]) == []
+            assert proxy_vault.append_audit_logs(db, []) == []
+            assert FiduciaryLogger(db).verify_chain(poa_id)["entries_checked"] == 1
+
+
+class TestAuditExportAPI:
+    """Test suite for /proxy/audit/export"""
+
+    def test_json_export_streams_the_whole_trail(self, client, session_factory, poa_id):
+        """The trail spans more than one yield_per page and still parses as one document"""
+        with session_factory() as db:
+            FiduciaryLogger(db).create_logs_bulk([_log_entry(poa_id, i) for i in range(600)])
+            log_ids = [log_id for (log_id,) in db.query(AuditLog.id).filter(AuditLog.poa_id == poa_id)]
+
+        response = client.get(f"/proxy/audit/export/{poa_id}", params={"format": "json"})
+
+        assert response.status_code == 200
+        export = response.json()
+        assert export["poa_id"] == poa_id
+        assert export["total_logs"] == len(export["logs"]) == 601
+        assert sorted(log["id"] for log in export["logs"]) == sorted(log_ids)
+        timestamps = [log["timestamp"] for log in export["logs"]]
+        assert timestamps == sorted(timestamps, reverse=True)
+
+    def test_bulk_export_returns_one_sealed_pdf_per_poa(self, client, session_factory, poa_id):
+        with session_factory() as db:
+            other_id = SmartPOAManager(db).create_poa("senior_002", "agent_001", "banking", 50.0).id
+
+        response = client.post("/proxy/audit/export/bulk", json={"poa_ids": [poa_id, other_id, poa_id]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert sorted(archive.namelist()) == sorted(
+                [f"audit_trail_poa_{poa_id}.pdf", f"audit_trail_poa_{other_id}.pdf"]
+            )
+            assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+        with session_factory() as db:
+            assert sorted(anchor.poa_id for anchor in db.query(AuditAnchor)) == sorted([poa_id, other_id])
+
+    def test_unknown_poa_is_rejected_before_sealing(self, client, session_factory, poa_id):
+        response = client.post("/proxy/audit/export/bulk", json={"poa_ids": [poa_id, 999999]})
+
+        assert response.status_code == 404
+        with session_factory() as db:
+            assert db.query(AuditAnchor).count() == 0
+
+    def test_pdf_export_is_sent_whole(self, client, session_factory, poa_id):
+        with session_factory() as db:
+            FiduciaryLogger(db).create_logs_bulk([_log_entry(poa_id, i) for i in range(150)])
+
+        response = client.get(f"/proxy/audit/export/{poa_id}", params={"format": "pdf"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/pdf"
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert response.content.startswith(b"%PDF")
+
+    def test_pdf_response_is_sliced(self):
+        import asyncio
+        import proxy_api
+
+        pdf_data = bytes(range(256)) * (proxy_api.PDF_CHUNK_SIZE // 128 + 1)
+
+        async def collect(response):
+            return [chunk async for chunk in response.body_iterator]
+
+        chunks = asyncio.run(collect(proxy_api._pdf_response(pdf_data, "trail.pdf")))
+
+        assert b"".join(chunks) == pdf_data
+        assert [len(chunk) for chunk in chunks] == [proxy_api.PDF_CHUNK_SIZE, proxy_api.PDF_CHUNK_SIZE, 256]
+
+    @pytest.mark.parametrize("count", [0, 101])
+    def test_empty_or_oversized_bulk_export_is_rejected(self, client, session_factory, poa_id, count):
+        response = client.post("/proxy/audit/export/bulk", json={"poa_ids": [poa_id] * count})
+
+        assert response.status_code == 400
+        with session_factory() as db:
+            assert db.query(AuditAnchor).count() == 0
+
+
+class TestTokenBatchAPI:
+    """Test suite for /proxy/tokens/store/batch"""
+
+    def test_tokens_are_stored_in_order(self, client, session_factory, poa_id):
+        response = client.post("/proxy/tokens/store/batch", json={"poa_id": poa_id, "tokens": [
+            {"service_name": "AT&T", "token": "att-token"},
+            {"service_name": "Netflix", "token": "netflix-token", "expires_in_seconds": 3600}
+        ]})
+
+        assert response.status_code == 200
+        with session_factory() as db:
+            manager = SmartPOAManager(db)
+            assert [manager.get_decrypted_token(token_id) for token_id in response.json()["token_ids"]] == [
+                "att-token", "netflix-token"
+            ]
+
+    def test_empty_batch_is_rejected(self, client, poa_id):
+        response = client.post("/proxy/tokens/store/batch", json={"poa_id": poa_id, "tokens": []})
+
+        assert response.status_code == 422
+
+    def test_empty_store_writes_nothing(self, session_factory, poa_id):
+        with session_factory() as db:
+            assert SmartPOAManager(db).store_oauth_tokens(poa_id, []) == []
+
+
+class TestValidateAPI:
+    """Test suite for /proxy/tokens/validate"""
+
+    @pytest.mark.parametrize("service_name", ["AT&T", "Netflix"])
+    def test_poa_is_serialized_without_internals(self, client, session_factory, service_name):
+        with session_factory() as db:
+            poa_id = SmartPOAManager(db).create_poa(
+                "senior_001", "agent_001", "utilities", 100.0, specific_services=["AT&T"]
+            ).id
+
+        response = client.post("/proxy/tokens/validate", json={"poa_id": poa_id, "service_name": service_name})
+
+        assert response.status_code == 200
+        poa = response.json()["poa"]
+        assert not [key for key in poa if key.startswith("_")]
+        assert response.json()["authorized"] is (service_name == "AT&T")
+
+
+# ============================================================================
+# POA CACHE TESTS
+# ============================================================================
+
+class _MemoryRedis:
+    """The slice of the redis client POAStateCache uses (no expiry)"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+class TestPOAStateCache:
+    """Test suite for cached POA snapshots and revocation"""
+
+    def test_revoked_poa_is_not_served_from_cache(self, session_factory, poa_id):
+        cache = POAStateCache(_MemoryRedis())
+        with session_factory() as db:
+            assert TokenGatekeeper(db, poa_cache=cache).validate_request(poa_id, "AT&T")["authorized"]
+            assert cache.get(poa_id) is not None
+
+            SmartPOAManager(db, poa_cache=cache).revoke_poa(poa_id, "test", "senior_001")
+            result = TokenGatekeeper(db, poa_cache=cache).validate_request(poa_id, "AT&T")
+
+        assert result["authorized"] is False
+        assert result["reasoning"] == "POA is expired or revoked"
+
+    def test_snapshot_read_before_revocation_is_not_put_back(self, session_factory, poa_id):
+        """A validation that loaded the POA before a revoke can't re-cache it afterwards"""
+        cache = POAStateCache(_MemoryRedis())
+        with session_factory() as db:
+            stale = SmartPOAManager(db).get_poa(poa_id)
+        with session_factory() as db:
+            SmartPOAManager(db, poa_cache=cache).revoke_poa(poa_id, "test", "senior_001")
+
+        cache.put(stale)
+
+        assert cache.get(poa_id) is None
+
+    def test_unreachable_redis_does_not_fail_revocation(self, session_factory, poa_id):
+        redis = pytest.importorskip("redis")
+
+        class _DownRedis(_MemoryRedis):
+            def set(self, key, value, ex=None, nx=False):
+                raise redis.ConnectionError("down")
+
+        with session_factory() as db:
+            assert SmartPOAManager(db, poa_cache=POAStateCache(_DownRedis())).revoke_poa(poa_id, "test", "senior_001")
+            logs = FiduciaryLogger(db).get_logs_by_poa(poa_id, action_type="POA_REVOKED")
+
+        assert len(logs) == 1
+
+
+# ============================================================================
+# SIGNATURE AND ENCRYPTION TESTS
+# ============================================================================
+
+class TestSignatures:
+    """Test suite for keyed BLAKE2b audit signatures"""
+
+    def test_signature_round_trip(self):
+        encryption = get_vault_encryption()
+        signature = encryption.sign_data({"poa_id": 1, "decision": "ALLOWED"})
+
+        assert signature.startswith(proxy_vault.BLAKE2_PREFIX)
+        assert encryption.verify_signature({"decision": "ALLOWED", "poa_id": 1}, signature)
+        assert not encryption.verify_signature({"poa_id": 1, "decision": "BLOCKED"}, signature)
+
+    def test_legacy_hmac_signature_verifies(self):
+        encryption = get_vault_encryption()
+        message = b'{"poa_id":1}'
+
+        assert encryption.verify_bytes(message, _legacy_sign(encryption.secret_key, message))
+        assert not encryption.verify_bytes(b'{"poa_id":2}', _legacy_sign(encryption.secret_key, message))
+
+
+class TestTokenEncryption:
+    """Test suite for AES-256-GCM token encryption"""
+
+    def test_round_trip(self):
+        encryption = get_vault_encryption()
+        first = encryption.encrypt_token("oauth-token")
+        second = encryption.encrypt_token("oauth-token")
+
+        assert first[:1] == proxy_vault.TOKEN_FORMAT_AESGCM
+        assert first != second  # fresh nonce per token
+        assert encryption.decrypt_token(first) == "oauth-token"
+
+    def test_tampered_token_is_rejected(self):
+        encryption = get_vault_encryption()
+        token = bytearray(encryption.encrypt_token("oauth-token"))
+        token[-1] ^= 1
+
+        with pytest.raises(InvalidTag):
+            encryption.decrypt_token(bytes(token))
+
+    def test_legacy_fernet_token_decrypts(self):
+        encryption = get_vault_encryption()
+        legacy = base64.urlsafe_b64decode(encryption.cipher.encrypt(b"oauth-token"))
+
+        assert encryption.decrypt_token(legacy) == "oauth-token"
+
+
+# ============================================================================
+# RUN TESTS
+# ============================================================================
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
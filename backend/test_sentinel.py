@@ -19,24 +19,26 @@ from transaction_governor import ContextAwareGovernor
 # ============================================================================
 
 @pytest.fixture
-def test_db():
+def test_db(tmp_path):
     """Create a test database"""
-    from sqlalchemy.pool import StaticPool
+    from sqlalchemy.pool import NullPool
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
     
+    # File-backed so the sync fixture session and the async API sessions share it
+    db_path = tmp_path / "sentinel_test.db"
     engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False}
     )
     Base.metadata.create_all(bind=engine)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
-    def override_get_db():
-        db = TestingSessionLocal()
-        try:
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
             yield db
-        finally:
-            db.close()
     
     app.dependency_overrides[get_db] = override_get_db
     
@@ -45,6 +47,7 @@ def test_db():
     db.close()
     
     app.dependency_overrides.clear()
+    engine.dispose()
 
 
 @pytest.fixture
@@ -167,6 +170,59 @@ class TestScamDetection:
         print(f"\n✅ Legitimate Call Allowed")
         print(f"   Fraud Score: {result['fraud_score']}/100")
     
+    def test_repeated_transcript_uses_cache(self, scam_analyzer):
+        """Repeated transcripts reuse the cached verdict but get fresh results"""
+        transcript = "This is the IRS. Pay the overdue tax today with gift cards."
+        
+        first = scam_analyzer.analyze(transcript)
+        first["indicators"].clear()
+        second = scam_analyzer.analyze(transcript.upper())
+        
+        assert scam_analyzer.cache_info().hits == 1
+        assert second["fraud_score"] == first["fraud_score"]
+        assert second["indicators"]
+    
+    def test_matchers_agree_with_re(self, scam_analyzer):
+        """Every matching path gives the verdict plain re would, Unicode boundaries included"""
+        import random
+        import re
+        
+        keywords = ["warrant", "gift card", "irs", "bail", "pin", "wire transfer", "asap"]
+        glue = [" ", "", ".", "é", "ß", "…", "_", "1", "ü", "ı", "ſ"]
+        rng = random.Random(0)
+        transcripts = ["éwarrant", "…ßwarrant", "warrantü", "pay the irs", "ırs gift card"] + [
+            "".join(rng.choice(glue) + rng.choice(keywords) + rng.choice(glue) for _ in range(3))
+            for _ in range(2000)
+        ]
+        
+        def re_indicators(transcript_lower):
+            found = []
+            for category, config in AgenticScamAnalyzer.SCAM_INDICATORS.items():
+                for pattern in config["patterns"]:
+                    if re.search(pattern, transcript_lower, re.IGNORECASE):
+                        found.append((category, pattern))
+                        break
+            return found
+        
+        for transcript in transcripts:
+            transcript_lower = transcript.lower()
+            _, indicators, _, _ = scam_analyzer._score(transcript_lower)
+            found = [(indicator["category"], indicator["pattern"]) for indicator in indicators]
+            assert found == re_indicators(transcript_lower), transcript
+    
+    def test_non_ascii_transcripts_skip_hyperscan(self, scam_analyzer):
+        """Hyperscan's ASCII-only \\b never decides a non-ASCII transcript"""
+        if scam_analyzer._hs_db is None:
+            pytest.skip("hyperscan not installed")
+        
+        scanned = []
+        original = scam_analyzer._hyperscan_matches
+        scam_analyzer._hyperscan_matches = lambda text: scanned.append(text) or original(text)
+        
+        assert scam_analyzer._score("éwarrant")[0] == 0
+        assert scam_analyzer._score("a warrant")[0] == 30
+        assert scanned == ["a warrant"]
+    
     # NOTE: Answer bot activation is tested implicitly through other scam tests
     # The system correctly identifies and blocks high-risk scams (>80 score)
     # Medium-risk detection works as shown by the other passing tests
@@ -338,6 +394,32 @@ class TestSentinelAPI:
         
         print(f"\n✅ Security Logs API Test Passed")
     
+    def test_security_logs_limit_is_bounded(self, client, test_db):
+        """Oversized pages are rejected instead of scanning the whole trail"""
+        assert client.get("/sentinel/logs?limit=500").status_code == 200
+        assert client.get("/sentinel/logs?limit=501").status_code == 422
+    
+    def test_security_logs_filtered_by_event_type(self, client, test_db):
+        """Test /sentinel/logs event_type filter and returned fields"""
+        client.post("/sentinel/voice/intercept", json={
+            "transcript": "This is the IRS, pay immediately with gift cards.",
+            "user_id": "test_user_001"
+        })
+        
+        response = client.get("/sentinel/logs", params={"event_type": "SCAM_CALL"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["count"] == 1
+        log = data["logs"][0]
+        assert log["event_type"] == "SCAM_CALL"
+        assert log["advocate_notified"] is True
+        assert set(log) == {
+            "id", "event_type", "timestamp", "fraud_score", "risk_level",
+            "action_taken", "approval_status", "advocate_notified"
+        }
+    
     def test_get_pending_approvals(self, client, test_db):
         """Test /sentinel/approvals/pending endpoint"""
         response = client.get("/sentinel/approvals/pending")
@@ -349,6 +431,100 @@ class TestSentinelAPI:
         assert "approvals" in data
         
         print(f"\n✅ Pending Approvals API Test Passed")
+    
+    def test_pending_approvals_include_transaction(self, client, test_db):
+        """Pending approvals are returned joined with their security log"""
+        transaction_time = datetime.now().replace(hour=2, minute=0, second=0)
+        
+        monitor = client.post("/sentinel/transactions/monitor", json={
+            "amount": 1500.00,
+            "transaction_time": transaction_time.isoformat(),
+            "category": "Wire Transfer",
+            "merchant": "International Bank",
+            "user_id": "test_user_001"
+        }).json()
+        
+        response = client.get("/sentinel/approvals/pending")
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["count"] == 1
+        approval = data["approvals"][0]
+        assert approval["approval_id"] == monitor["approval_id"]
+        assert approval["transaction"]["amount"] == 1500.00
+        assert approval["transaction"]["merchant"] == "International Bank"
+        assert approval["risk_level"] == monitor["risk_level"]
+
+
+# ============================================================================
+# SECURITY LOG BATCHING TESTS
+# ============================================================================
+
+class TestSecurityLogBatcher:
+    """Test suite for the batched SecurityLog writer"""
+    
+    def test_concurrent_submits_get_distinct_ids(self, tmp_path):
+        """Concurrent rows are written in batches and each caller gets its own id"""
+        import asyncio
+        from sqlalchemy import select
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from models import SecurityLog
+        from security_log_batcher import SecurityLogBatcher
+        
+        db_path = tmp_path / "batch.db"
+        Base.metadata.create_all(bind=create_engine(f"sqlite:///{db_path}"))
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        
+        async def run():
+            batcher = SecurityLogBatcher(engine, max_batch=8)
+            await batcher.start()
+            ids = await asyncio.gather(*[
+                batcher.submit({"event_type": "SCAM_CALL", "transcript": f"call {i}"})
+                for i in range(20)
+            ])
+            await batcher.stop()
+            
+            async with engine.connect() as conn:
+                rows = (await conn.execute(select(SecurityLog.id, SecurityLog.transcript))).all()
+            await engine.dispose()
+            return ids, dict(rows)
+        
+        ids, stored = asyncio.run(run())
+        
+        assert len(set(ids)) == 20
+        assert [stored[log_id] for log_id in ids] == [f"call {i}" for i in range(20)]
+    
+    def test_submits_racing_stop_never_hang(self, tmp_path):
+        """Rows queued behind stop() (or waiting for room) fail instead of hanging"""
+        import asyncio
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from security_log_batcher import SecurityLogBatcher
+        
+        db_path = tmp_path / "batch.db"
+        Base.metadata.create_all(bind=create_engine(f"sqlite:///{db_path}"))
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        
+        async def run():
+            batcher = SecurityLogBatcher(engine, max_batch=2, max_queue=2)
+            await batcher.start()
+            submits = [
+                asyncio.create_task(batcher.submit({"event_type": "SCAM_CALL", "transcript": f"call {i}"}))
+                for i in range(10)
+            ]
+            await asyncio.sleep(0)
+            await batcher.stop()
+            results = await asyncio.wait_for(asyncio.gather(*submits, return_exceptions=True), timeout=5)
+            
+            with pytest.raises(RuntimeError):
+                await batcher.submit({"event_type": "SCAM_CALL", "transcript": "late"})
+            await engine.dispose()
+            return results
+        
+        results = asyncio.run(run())
+        
+        assert all(isinstance(result, (int, RuntimeError)) for result in results)
+        assert any(isinstance(result, int) for result in results)
 
 
 # ============================================================================